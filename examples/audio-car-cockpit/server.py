@@ -1,33 +1,97 @@
+import asyncio
 import base64
+import json
+import tempfile
 import webbrowser
+from concurrent.futures import Future
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 from pathlib import Path
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
 from openai import AsyncOpenAI
 
+from src.audio_framing import decode_frame, encode_frame
 from src.checklist import create_checklist_router
 from src.connection_manager import ConnectionManager
 from src.functions import create_functions_router
-from src.llamacpp_inference import ToolCallingRuntime, function_to_args, spawn_server
+from src.llamacpp_inference import (
+    ToolCallingRouter,
+    ToolCallingRuntime,
+    function_to_args,
+    parse_tool_call_stream,
+)
+from src.llamacpp_supervisor import ServerReplica, ServerSupervisor
 from src.settings import p_env
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Setting up...")
+    loop = asyncio.get_running_loop()
+    runtimes: list[ToolCallingRuntime] = []
+
+    # Callbacks run in the supervisor threads, possibly before the runtimes are created
+    def on_exit(replica: ServerReplica):
+        # Route around it until it is back
+        if replica.index < len(runtimes):
+            runtimes[replica.index].ready = False
+
+    def warm_up(replica: ServerReplica, attempts: int = 3):
+        future = asyncio.run_coroutine_threadsafe(runtimes[replica.index].warmup(), loop)
+
+        def on_done(future: Future):
+            if future.cancelled() or future.exception() is None:
+                return
+            print(f"Warmup of llama-server replica {replica.index} failed: {future.exception()!r}")
+            if not replica.ready:
+                # Exited meanwhile, it is warmed up again once back
+                return
+            if attempts > 1:
+                warm_up(replica, attempts - 1)
+            elif replica.process is not None:
+                print(f"Restarting llama-server replica {replica.index}...")
+                replica.process.terminate()
+
+        future.add_done_callback(on_done)
+
+    def on_ready(replica: ServerReplica):
+        # A restarted llama-server starts with an empty KV cache
+        if replica.index < len(runtimes):
+            warm_up(replica)
 
     # Prepare inference runtimes
-    with (
-        spawn_server(file_name="LiquidAI/LFM2-1.2B-Tool-GGUF:Q8_0") as (_, port_lm),
-    ):
-        app.state.tcr = ToolCallingRuntime(port=port_lm)
+    with tempfile.TemporaryDirectory(prefix="slots_") as slot_save_path:
+        supervisor = ServerSupervisor(
+            file_name="LiquidAI/LFM2-1.2B-Tool-GGUF:Q8_0",
+            replicas=p_env.TOOL_SERVER_REPLICAS,
+            parallel=p_env.TOOL_SERVER_PARALLEL,
+            slot_save_path=Path(slot_save_path),
+            on_ready=on_ready,
+            on_exit=on_exit,
+        )
+        # Replicas load the model concurrently
+        await asyncio.to_thread(supervisor.start)
+        try:
+            runtimes.extend(
+                ToolCallingRuntime(
+                    port=replica.port, parallel=p_env.TOOL_SERVER_PARALLEL, top_k_tools=p_env.TOOL_RETRIEVAL_TOP_K
+                )
+                for replica in supervisor.replicas
+            )
+            app.state.tcr = ToolCallingRouter(runtimes)
+            await asyncio.gather(*(runtime.warmup() for runtime in runtimes))
 
-        _url = p_env.DEMO_URL.unicode_string()
-        print(f"Ready, opening: {_url}")
-        webbrowser.open(_url, new=0, autoraise=True)
-        yield
+            _url = p_env.DEMO_URL.unicode_string()
+            print(f"Ready, opening: {_url}")
+            webbrowser.open(_url, new=0, autoraise=True)
+            try:
+                yield
+            finally:
+                await app.state.tcr.aclose()
+        finally:
+            supervisor.stop()
 
 
 # Initialize FastAPI app and connection manager
@@ -68,22 +132,23 @@ async def get_index():
 
 # Tool calling example endpoints
 @app.get("/toolcall/single/{query}")
-async def tool_calling_single_turn(query: str):
-    tcr: ToolCallingRuntime = app.state.tcr
+async def tool_calling_single_turn(query: str, session: str | None = None):
+    tcr: ToolCallingRouter = app.state.tcr
 
-    tool_call, text = tcr.completion(query)
+    tool_call, text, stats = await tcr.completion_with_stats(query)
+    print(f"Tool calling: {stats}")
 
     if tool_call is not None:
         func_name, args = function_to_args(tool_call)
 
-        if not manager.active_connections:
+        ws = manager.get_cockpit(session)
+        if ws is None:
             print("No active cockpit connections")
         else:
-            ws = manager.active_connections[0]
             result = await manager.send_rpc_request(ws, func_name, args)
             print(f"Function call result:\n{result}")
 
-    return JSONResponse(content={"tool_call": tool_call, "text": text})
+    return JSONResponse(content={"tool_call": tool_call, "text": text, "stats": asdict(stats)})
 
 
 # Include routers
@@ -94,36 +159,184 @@ app.include_router(create_checklist_router(manager))
 # WebSocket endpoint for cockpit control
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+    # Shared with the page's `/ws-audio` connections, to route their tool calls here
+    await manager.connect(websocket, session_id=websocket.query_params.get("session"))
     try:
         while True:
             data = await websocket.receive_text()
             await manager.handle_websocket_message(websocket, data)
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
 
+async def send_audio_chunk(websocket: WebSocket, chunk_b64: str):
+    """Forward a float32 PCM chunk from the audio server as a binary frame."""
+    # Decoded once here, the browser then reads the samples without any copy
+    frame = encode_frame({"type": "audio", "sample_rate": 24000}, base64.b64decode(chunk_b64))
+    # Send audio chunk immediately for low latency
+    await websocket.send_bytes(frame)
+
+
+async def receive_request(websocket: WebSocket) -> tuple[dict, bytes | memoryview | None]:
+    """Receive a request, either a binary frame carrying a WAV file or a JSON message."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+
+    if message.get("bytes") is not None:
+        return decode_frame(message["bytes"])
+
+    data = json.loads(message["text"])
+    # JSON clients send the audio base64 encoded
+    audio_b64 = data.pop("audio", None)
+    return data, base64.b64decode(audio_b64) if audio_b64 else None
+
+
+async def stream_tts(websocket: WebSocket, audio_client: AsyncOpenAI, text: str, voice: str):
+    """Synthesize `text` and forward the audio chunks as they are generated."""
+    tts_messages = [
+        {
+            "role": "system",
+            "content": f"Perform TTS. Use the {voice} voice.",
+        },
+        {"role": "user", "content": text},
+    ]
+
+    tts_stream = await audio_client.chat.completions.create(
+        model="",
+        messages=tts_messages,
+        stream=True,
+        max_tokens=512,
+    )
+
+    async for chunk in tts_stream:
+        delta = chunk.choices[0].delta
+
+        if hasattr(delta, "audio_chunk") and delta.audio_chunk:
+            await send_audio_chunk(websocket, delta.audio_chunk["data"])
+
+
+async def tool_calling_pipeline(
+    websocket: WebSocket, audio_client: AsyncOpenAI, transcribed_text: str, voice: str, session_id: str | None
+):
+    """Run tool calling, the cockpit RPC and TTS as overlapping stages.
+
+    The tool model output is streamed: the RPC is sent as soon as the tool call is complete,
+    and each sentence of the response is synthesized while the next ones are generated.
+    """
+    tcr: ToolCallingRouter = app.state.tcr
+    sentences: asyncio.Queue[str | None] = asyncio.Queue()
+
+    async def speak():
+        while (sentence := await sentences.get()) is not None:
+            print(f"[AUDIO] Sending to TTS with voice '{voice}': '{sentence}'")
+            await stream_tts(websocket, audio_client, sentence, voice)
+
+    tts_task = asyncio.create_task(speak())
+    rpc_task: asyncio.Task | None = None
+
+    tool_call = None
+    formatted_tool_name = None
+    tool_call_valid = True
+    response_sentences: list[str] = []
+    error_text: str | None = None
+
+    async def fail(text: str):
+        nonlocal error_text, tool_call_valid
+        # Override the model response with the error message
+        error_text = text
+        tool_call_valid = False
+        await sentences.put(text)
+
+    async def wait_rpc():
+        nonlocal rpc_task, tool_call_valid
+        if rpc_task is None:
+            return
+        task, rpc_task = rpc_task, None
+        try:
+            result = await task
+            if result is not None:
+                tool_call_valid = result
+            print(f"[AUDIO] Function call result: {result}")
+        except Exception as e:  # noqa: BLE001 - RPC errors and timeouts are raised as plain `Exception`
+            print(f"[AUDIO] Function call error: {e}")
+            await fail(f"Sorry, the model called the non-existing function: {tool_call}")
+
+    try:
+        print("[AUDIO] Processing through tool calling model...")
+        async for kind, value in parse_tool_call_stream(tcr.completion(transcribed_text, stream=True)):
+            if kind == "tool_call":
+                # Execute function call as soon as it is complete
+                print(f"[AUDIO] Tool call detected: {value}")
+                tool_call = formatted_tool_name = value
+                try:
+                    func_name, args = function_to_args(tool_call)
+                except (SyntaxError, ValueError) as e:
+                    print(f"[AUDIO] Function call error: {e}")
+                    await fail(f"Sorry, the model called the non-existing function: {tool_call}")
+                    continue
+                formatted_tool_name = func_name
+
+                ws = manager.get_cockpit(session_id)
+                if ws is None:
+                    print("[AUDIO] No active cockpit connections")
+                    error_text = "Sorry, the cockpit is not connected."
+                    await sentences.put(error_text)
+                else:
+                    rpc_task = asyncio.create_task(manager.send_rpc_request(ws, func_name, args))
+            else:
+                # Only speak once the cockpit accepted the call, errors replace the response
+                await wait_rpc()
+                response_sentences.append(value)
+                if error_text is None:
+                    await sentences.put(value)
+
+        await wait_rpc()
+        if tool_call is None:
+            print("[AUDIO] No tool call detected")
+
+        response_text = error_text if error_text is not None else " ".join(response_sentences)
+
+        # Send caption, while the response is still being spoken
+        await websocket.send_json(
+            {
+                "type": "caption",
+                "role": "model",
+                "text": response_text,
+                "tool": formatted_tool_name,
+                "tool_valid": tool_call_valid,
+            }
+        )
+
+        await sentences.put(None)
+        await tts_task
+    finally:
+        tts_task.cancel()
+        if rpc_task is not None:
+            rpc_task.cancel()
+
+
 # WebSocket endpoint for audio (STT/TTS)
 @app.websocket("/ws-audio")
 async def websocket_audio_endpoint(websocket: WebSocket):
     await websocket.accept()
+    session_id = websocket.query_params.get("session")
     audio_client = AsyncOpenAI(base_url=f"http://127.0.0.1:{p_env.AUDIO_SERVER_PORT}/v1", api_key="dummy")
 
     voice = "US female"
 
     try:
         while True:
-            data = await websocket.receive_json()
+            data, wav_data = await receive_request(websocket)
             mode = data.get("mode", "asr")
             text = data.get("text")
-            audio_b64 = data.get("audio")
-
-            wav_data = base64.b64decode(audio_b64) if audio_b64 else None
 
             # Build messages based on mode
             if mode == "asr":
                 print("\n[AUDIO] Starting ASR (Speech-to-Text)...")
-                if wav_data is None:
+                if not wav_data:
                     continue
                 messages = [
                     {"role": "system", "content": "Perform ASR."},
@@ -170,9 +383,7 @@ async def websocket_audio_endpoint(websocket: WebSocket):
                     await websocket.send_json({"type": "text", "data": _text_content})
 
                 if hasattr(delta, "audio_chunk") and delta.audio_chunk:
-                    chunk_data = delta.audio_chunk["data"]
-                    # Send audio chunk immediately for low latency
-                    await websocket.send_json({"type": "audio", "data": chunk_data, "sample_rate": 24000})
+                    await send_audio_chunk(websocket, delta.audio_chunk["data"])
 
             # If ASR mode, process through tool calling and then TTS
             if mode == "asr" and transcribed_text:
@@ -181,75 +392,8 @@ async def websocket_audio_endpoint(websocket: WebSocket):
                 # Send User caption
                 await websocket.send_json({"type": "caption", "role": "driver", "text": transcribed_text})
 
-                # Process through tool calling runtime
-                print("[AUDIO] Processing through tool calling model...")
-                tcr: ToolCallingRuntime = app.state.tcr
-                tool_call, response_text = tcr.completion(transcribed_text)
-
-                formatted_tool_name = None
-                tool_call_valid = True
-
-                # Execute function call if present
-                if tool_call is not None:
-                    print(f"[AUDIO] Tool call detected: {tool_call}")
-                    formatted_tool_name = tool_call
-                    try:
-                        func_name, args = function_to_args(tool_call)
-                        formatted_tool_name = func_name
-
-                        if not manager.active_connections:
-                            print("[AUDIO] No active cockpit connections")
-                            response_text = "Sorry, the cockpit is not connected."
-                        else:
-                            ws = manager.active_connections[0]
-                            result = await manager.send_rpc_request(ws, func_name, args)
-                            if result is not None:
-                                tool_call_valid = result
-                            print(f"[AUDIO] Function call result: {result}")
-                    except Exception as e:
-                        print(f"[AUDIO] Function call error: {e}")
-                        # Override response with error message
-                        response_text = f"Sorry, the model called the non-existing function: {tool_call}"
-                        tool_call_valid = False
-                else:
-                    print("[AUDIO] No tool call detected")
-
-                # Send caption
-                await websocket.send_json(
-                    {
-                        "type": "caption",
-                        "role": "model",
-                        "text": response_text,
-                        "tool": formatted_tool_name,
-                        "tool_valid": tool_call_valid,
-                    }
-                )
-
-                # Send the response text to TTS
                 voice = data.get("voice", None) or voice
-                print(f"[AUDIO] Sending to TTS with voice '{voice}': '{response_text}'")
-                tts_messages = [
-                    {
-                        "role": "system",
-                        "content": f"Perform TTS. Use the {voice} voice.",
-                    },
-                    {"role": "user", "content": response_text},
-                ]
-
-                tts_stream = await audio_client.chat.completions.create(
-                    model="",
-                    messages=tts_messages,
-                    stream=True,
-                    max_tokens=512,
-                )
-
-                async for chunk in tts_stream:
-                    delta = chunk.choices[0].delta
-
-                    if hasattr(delta, "audio_chunk") and delta.audio_chunk:
-                        chunk_data = delta.audio_chunk["data"]
-                        # Send audio chunk immediately for low latency
-                        await websocket.send_json({"type": "audio", "data": chunk_data, "sample_rate": 24000})
+                await tool_calling_pipeline(websocket, audio_client, transcribed_text, voice, session_id)
 
             await websocket.send_json({"type": "done"})
 
@@ -0,0 +1,34 @@
+import json
+import struct
+
+# Binary WebSocket frame layout, used by `/ws-audio` in both directions:
+#
+#   uint32 (little endian) header length | JSON header | raw payload
+#
+# The header is padded with spaces so the payload starts on a 4-byte boundary, which
+# lets the browser read float32 PCM in place with `new Float32Array(buffer, offset)`.
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def encode_frame(header: dict, payload: bytes = b"") -> bytes:
+    """Pack a JSON header and raw bytes (WAV file, PCM samples) into one binary frame."""
+
+    header_bytes = json.dumps(header).encode("utf-8")
+    header_bytes += b" " * (-(_HEADER_LENGTH.size + len(header_bytes)) % 4)
+    return b"".join((_HEADER_LENGTH.pack(len(header_bytes)), header_bytes, payload))
+
+
+def decode_frame(frame: bytes) -> tuple[dict, memoryview]:
+    """Unpack a binary frame into its JSON header and a zero-copy view of the payload."""
+
+    if len(frame) < _HEADER_LENGTH.size:
+        raise ValueError(f"Frame too short: {len(frame)} bytes")
+
+    (header_length,) = _HEADER_LENGTH.unpack_from(frame)
+    payload_start = _HEADER_LENGTH.size + header_length
+    if len(frame) < payload_start:
+        raise ValueError(f"Frame shorter than its header: {len(frame)} < {payload_start} bytes")
+
+    view = memoryview(frame)
+    header = json.loads(bytes(view[_HEADER_LENGTH.size : payload_start]))
+    return header, view[payload_start:]
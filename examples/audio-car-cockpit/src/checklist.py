@@ -1,6 +1,10 @@
 import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
 
-from fastapi import APIRouter
+from fastapi import APIRouter, WebSocket
 from fastapi.responses import JSONResponse
 
 from .connection_manager import ConnectionManager
@@ -8,311 +12,249 @@ from .connection_manager import ConnectionManager
 router = APIRouter()
 
 
-def create_checklist_router(manager: ConnectionManager) -> APIRouter:
-    """Create and configure the checklist testing router."""
-
-    @router.get("/checklist/quick-check")
-    async def quick_check():
-        """
-        Quick system check - tests a few basic functions:
-        - Open and close front-right window
-        - Set climate temperature
-        - Get system state
-        """
-        if not manager.active_connections:
-            return JSONResponse(
-                status_code=503,
-                content={"status": "error", "message": "No active cockpit connections"},
-            )
-
-        ws = manager.active_connections[0]
+@dataclass(kw_only=True)
+class Check:
+    test: str
+    method: str
+    params: dict = field(default_factory=dict)
+    # Builds the report fields from the RPC result, e.g. `{"result": ..., "passed": ...}`
+    report: Callable[[Any], dict] = lambda result: {"result": result}
+    # Setup/cleanup calls are only reported when they fail to run
+    reported: bool = True
+
+
+# A step is a list of independent checks, sent as a single batch.
+# A chain is a list of steps run in order (e.g. set then verify), chains run concurrently.
+Step = list[Check]
+Chain = list[Step]
+
+
+async def _run_step(manager: ConnectionManager, ws: WebSocket, step: Step) -> list[dict]:
+    start = time.perf_counter()
+    try:
+        responses = await manager.send_rpc_batch(ws, [(check.method, check.params) for check in step])
+    except Exception as e:
+        responses = [e] * len(step)
+    # Checks of a batch share its round trip
+    latency_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    results = []
+    for check, response in zip(step, responses):
+        entry: dict[str, Any] = {"test": check.test}
+        if isinstance(response, Exception):
+            entry |= {"error": str(response), "passed": False}
+        elif not check.reported:
+            continue
+        else:
+            try:
+                entry |= check.report(response)
+            except Exception as e:
+                entry |= {"error": f"Unexpected result {response!r}: {e!r}", "passed": False}
+        entry["latency_ms"] = latency_ms
+        results.append(entry)
+    return results
+
+
+async def run_checklist(manager: ConnectionManager, ws: WebSocket, chains: list[Chain]) -> list[dict]:
+    """Run the chains concurrently, returning the report of every check in chain order.
+
+    A chain stops at its first failed step, since the following steps depend on it.
+    """
+
+    async def run_chain(chain: Chain) -> list[dict]:
         results = []
-
-        try:
-            # Test 1: Open front-right window
-            results.append(
-                {
-                    "test": "Open front-right window",
-                    "result": await manager.send_rpc_request(ws, "carWindows.set", {"id": "fr", "open": True}),
-                }
+        for step in chain:
+            step_results = await _run_step(manager, ws, step)
+            results.extend(step_results)
+            if any("error" in r for r in step_results):
+                break
+        return results
+
+    chain_results = await asyncio.gather(*(run_chain(chain) for chain in chains))
+    return [r for results in chain_results for r in results]
+
+
+def _state_report(state: dict) -> dict:
+    return {"result": "success" if state else "failed", "state_keys": list(state.keys()) if state else []}
+
+
+QUICK_CHECK: list[Chain] = [
+    [
+        [Check(test="Open front-right window", method="carWindows.set", params={"id": "fr", "open": True})],
+        [
+            Check(
+                test="Verify window opened",
+                method="carWindows.get",
+                params={"id": "fr"},
+                report=lambda state: {"result": state, "passed": state},
             )
-            await asyncio.sleep(0.5)
-
-            # Test 2: Check window state
-            window_state = await manager.send_rpc_request(ws, "carWindows.get", {"id": "fr"})
-            results.append(
-                {
-                    "test": "Verify window opened",
-                    "result": window_state,
-                    "passed": window_state,
-                }
+        ],
+        [Check(test="Close front-right window", method="carWindows.set", params={"id": "fr", "open": False})],
+    ],
+    [
+        [Check(test="Set temperature to 22°C", method="climate.setTarget", params={"temperature": 22})],
+        [
+            Check(
+                test="Verify temperature set",
+                method="climate.get",
+                report=lambda climate: {"result": climate, "passed": climate.get("targetTemp") == 22},
             )
-
-            # Test 3: Close window
-            results.append(
-                {
-                    "test": "Close front-right window",
-                    "result": await manager.send_rpc_request(ws, "carWindows.set", {"id": "fr", "open": False}),
-                }
+        ],
+    ],
+]
+
+FULL_SYSTEM_CHECK: list[Chain] = [
+    # === WINDOWS TESTS ===
+    [
+        [Check(test="Open all windows", method="carWindows.openAll")],
+        [
+            Check(
+                test="Verify all windows open",
+                method="carWindows.get",
+                report=lambda windows: {"result": windows, "passed": all(windows.values())},
             )
-            await asyncio.sleep(0.5)
-
-            # Test 4: Set climate temperature
-            results.append(
-                {
-                    "test": "Set temperature to 22°C",
-                    "result": await manager.send_rpc_request(ws, "climate.setTarget", {"temperature": 22}),
-                }
+        ],
+        [Check(test="Close all windows", method="carWindows.closeAll")],
+        [Check(test="Toggle rear-left window", method="carWindows.toggle", params={"id": "rl"})],
+    ],
+    # === MEDIA TESTS ===
+    [
+        [
+            Check(
+                test="Get media state",
+                method="media.get",
+                report=lambda media: {
+                    "result": f"Track: {media['track']['title']}" if "track" in media else "No track",
+                    "passed": "track" in media,
+                },
             )
-            await asyncio.sleep(0.5)
-
-            # Test 5: Verify climate state
-            climate_state = await manager.send_rpc_request(ws, "climate.get", {})
-            results.append(
-                {
-                    "test": "Verify temperature set",
-                    "result": climate_state,
-                    "passed": climate_state.get("targetTemp") == 22,
-                }
+        ],
+        [Check(test="Play media", method="media.play")],
+        [
+            Check(
+                test="Verify media playing",
+                method="media.get",
+                report=lambda media: {"result": media.get("isPlaying"), "passed": media.get("isPlaying")},
+            )
+        ],
+        [Check(test="Next track", method="media.next")],
+        [Check(test="Previous track", method="media.previous")],
+        [Check(test="Pause media", method="media.pause")],
+    ],
+    # === CLIMATE TESTS ===
+    [
+        [
+            Check(test="Set temperature to 24°C", method="climate.setTarget", params={"temperature": 24}),
+            Check(test="Set fan to level 3", method="climate.setFan", params={"level": 3}),
+        ],
+        [
+            Check(
+                test="Verify climate settings",
+                method="climate.get",
+                report=lambda climate: {
+                    "result": climate,
+                    "passed": climate.get("targetTemp") == 24 and climate.get("fanLevel") == 3,
+                },
+            )
+        ],
+        # Reset to defaults
+        [
+            Check(
+                test="Reset temperature to 23°C",
+                method="climate.setTarget",
+                params={"temperature": 23},
+                reported=False,
+            ),
+            Check(test="Reset fan to level 2", method="climate.setFan", params={"level": 2}, reported=False),
+        ],
+    ],
+    # === NAVIGATION TESTS ===
+    [
+        [Check(test="Set navigation destination", method="navigation.setDestination")],
+        [
+            Check(
+                test="Verify route generated",
+                method="navigation.get",
+                report=lambda nav: {
+                    "result": f"Route has {nav.get('totalSteps', 0)} steps",
+                    "passed": nav.get("totalSteps", 0) > 0,
+                },
             )
+        ],
+        [Check(test="Start navigation", method="navigation.start")],
+        [Check(test="Pause navigation", method="navigation.pause")],
+        [Check(test="Clear navigation", method="navigation.clear")],
+    ],
+]
 
-            # Test 6: Get full system state
-            state = await manager.send_rpc_request(ws, "system.getState", {})
-            results.append(
-                {
-                    "test": "Get system state",
-                    "result": "success" if state else "failed",
-                    "state_keys": list(state.keys()) if state else [],
-                }
+
+def create_checklist_router(manager: ConnectionManager) -> APIRouter:
+    """Create and configure the checklist testing router."""
+
+    async def run(session: str | None, chains: list[Chain], final_check: Check) -> dict | JSONResponse:
+        ws = manager.get_cockpit(session)
+        if ws is None:
+            return JSONResponse(
+                status_code=503,
+                content={"status": "error", "message": "No active cockpit connections"},
             )
 
-            return {"status": "success", "tests_run": len(results), "results": results}
+        start = time.perf_counter()
+        results = await run_checklist(manager, ws, chains)
+        # Once every subsystem is done
+        results += await run_checklist(manager, ws, [[[final_check]]])
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
 
-        except Exception as e:
+        errors = [r for r in results if "error" in r]
+        if errors:
             return JSONResponse(
                 status_code=500,
-                content={"status": "error", "message": str(e), "partial_results": results},
+                content={
+                    "status": "error",
+                    "message": f"{len(errors)} checks failed to run, first: {errors[0]['test']}: {errors[0]['error']}",
+                    "elapsed_ms": elapsed_ms,
+                    "partial_results": results,
+                },
             )
 
+        passed_tests = sum(1 for r in results if r.get("passed", True))
+        total_tests = len(results)
+        return {
+            "status": "success",
+            "summary": f"{passed_tests}/{total_tests} tests passed",
+            "tests_run": total_tests,
+            "tests_passed": passed_tests,
+            "elapsed_ms": elapsed_ms,
+            "results": results,
+        }
+
+    @router.get("/checklist/quick-check")
+    async def quick_check(session: str | None = None):
+        """
+        Quick system check - tests a few basic functions:
+        - Open and close front-right window
+        - Set climate temperature
+        - Get system state
+        """
+        final_check = Check(test="Get system state", method="system.getState", report=_state_report)
+        return await run(session, QUICK_CHECK, final_check)
+
     @router.get("/checklist/full-system")
-    async def full_system_check():
+    async def full_system_check(session: str | None = None):
         """
         Comprehensive system test - exercises all major functions:
         - All window controls
         - Media player controls
         - Climate controls
         - Navigation controls
-        """
-        if not manager.active_connections:
-            return JSONResponse(
-                status_code=503,
-                content={"status": "error", "message": "No active cockpit connections"},
-            )
-
-        ws = manager.active_connections[0]
-        results = []
 
-        try:
-            # === WINDOWS TESTS ===
-            # Test opening all windows
-            results.append(
-                {
-                    "test": "Open all windows",
-                    "result": await manager.send_rpc_request(ws, "carWindows.openAll", {}),
-                }
-            )
-            await asyncio.sleep(0.5)
-
-            # Verify all windows open
-            windows = await manager.send_rpc_request(ws, "carWindows.get", {})
-            results.append(
-                {
-                    "test": "Verify all windows open",
-                    "result": windows,
-                    "passed": all(windows.values()),
-                }
-            )
-
-            # Close all windows
-            results.append(
-                {
-                    "test": "Close all windows",
-                    "result": await manager.send_rpc_request(ws, "carWindows.closeAll", {}),
-                }
-            )
-            await asyncio.sleep(0.5)
-
-            # Test individual window toggle
-            results.append(
-                {
-                    "test": "Toggle rear-left window",
-                    "result": await manager.send_rpc_request(ws, "carWindows.toggle", {"id": "rl"}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # === MEDIA TESTS ===
-            # Get initial media state
-            media_state = await manager.send_rpc_request(ws, "media.get", {})
-            results.append(
-                {
-                    "test": "Get media state",
-                    "result": f"Track: {media_state['track']['title']}",
-                    "passed": "track" in media_state,
-                }
-            )
-
-            # Play media
-            results.append(
-                {
-                    "test": "Play media",
-                    "result": await manager.send_rpc_request(ws, "media.play", {}),
-                }
-            )
-            await asyncio.sleep(0.5)
-
-            # Verify playing
-            media_state = await manager.send_rpc_request(ws, "media.get", {})
-            results.append(
-                {
-                    "test": "Verify media playing",
-                    "result": media_state.get("isPlaying"),
-                    "passed": media_state.get("isPlaying"),
-                }
-            )
-
-            # Next track
-            results.append(
-                {
-                    "test": "Next track",
-                    "result": await manager.send_rpc_request(ws, "media.next", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Previous track
-            results.append(
-                {
-                    "test": "Previous track",
-                    "result": await manager.send_rpc_request(ws, "media.previous", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Pause
-            results.append(
-                {
-                    "test": "Pause media",
-                    "result": await manager.send_rpc_request(ws, "media.pause", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # === CLIMATE TESTS ===
-            # Set target temperature
-            results.append(
-                {
-                    "test": "Set temperature to 24°C",
-                    "result": await manager.send_rpc_request(ws, "climate.setTarget", {"temperature": 24}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Set fan level
-            results.append(
-                {
-                    "test": "Set fan to level 3",
-                    "result": await manager.send_rpc_request(ws, "climate.setFan", {"level": 3}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Verify climate state
-            climate = await manager.send_rpc_request(ws, "climate.get", {})
-            results.append(
-                {
-                    "test": "Verify climate settings",
-                    "result": climate,
-                    "passed": climate.get("targetTemp") == 24 and climate.get("fanLevel") == 3,
-                }
-            )
-
-            # Reset to defaults
-            await manager.send_rpc_request(ws, "climate.setTarget", {"temperature": 23})
-            await manager.send_rpc_request(ws, "climate.setFan", {"level": 2})
-
-            # === NAVIGATION TESTS ===
-            # Set destination
-            results.append(
-                {
-                    "test": "Set navigation destination",
-                    "result": await manager.send_rpc_request(ws, "navigation.setDestination", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Get navigation state
-            nav_state = await manager.send_rpc_request(ws, "navigation.get", {})
-            results.append(
-                {
-                    "test": "Verify route generated",
-                    "result": f"Route has {nav_state.get('totalSteps', 0)} steps",
-                    "passed": nav_state.get("totalSteps", 0) > 0,
-                }
-            )
-
-            # Start navigation
-            results.append(
-                {
-                    "test": "Start navigation",
-                    "result": await manager.send_rpc_request(ws, "navigation.start", {}),
-                }
-            )
-            await asyncio.sleep(1.0)
-
-            # Pause navigation
-            results.append(
-                {
-                    "test": "Pause navigation",
-                    "result": await manager.send_rpc_request(ws, "navigation.pause", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # Clear navigation
-            results.append(
-                {
-                    "test": "Clear navigation",
-                    "result": await manager.send_rpc_request(ws, "navigation.clear", {}),
-                }
-            )
-            await asyncio.sleep(0.3)
-
-            # === FINAL STATE CHECK ===
-            final_state = await manager.send_rpc_request(ws, "system.getState", {})
-            results.append(
-                {
-                    "test": "Final system state check",
-                    "result": "success",
-                    "state": final_state,
-                }
-            )
-
-            passed_tests = sum(1 for r in results if r.get("passed", True))
-            total_tests = len(results)
-
-            return {
-                "status": "success",
-                "summary": f"{passed_tests}/{total_tests} tests passed",
-                "tests_run": total_tests,
-                "tests_passed": passed_tests,
-                "results": results,
-            }
-
-        except Exception as e:
-            return JSONResponse(
-                status_code=500,
-                content={"status": "error", "message": str(e), "partial_results": results},
-            )
+        Subsystems are tested concurrently, each one in order.
+        """
+        final_check = Check(
+            test="Final system state check",
+            method="system.getState",
+            report=lambda state: {"result": "success", "state": state},
+        )
+        return await run(session, FULL_SYSTEM_CHECK, final_check)
 
     return router
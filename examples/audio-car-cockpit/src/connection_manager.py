@@ -1,24 +1,73 @@
 import asyncio
+import itertools
 import json
 from typing import Any
 
 from fastapi import WebSocket
 
+from .function_catalog import FunctionCatalog
+
 
 class ConnectionManager:
     def __init__(self):
         self.active_connections: list[WebSocket] = []
-        # Track pending requests: request_id -> Future
-        self.pending_requests: dict[int, asyncio.Future] = {}
+        # Track pending requests per connection: websocket -> request_id -> Future
+        self.pending_requests: dict[WebSocket, dict[int, asyncio.Future]] = {}
+        # Cockpit connection of each browser session, so audio sessions drive their own cockpit
+        self.sessions: dict[str, WebSocket] = {}
+        # Monotonic, so IDs are never reused while a request is still pending
+        self._request_ids = itertools.count(1)
+        # Function catalog of each cockpit, fetched once and dropped when the cockpit reports a change
+        self._function_catalogs: dict[WebSocket, asyncio.Task[FunctionCatalog]] = {}
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, session_id: str | None = None):
         await websocket.accept()
         self.active_connections.append(websocket)
+        self.pending_requests[websocket] = {}
+        if session_id is not None:
+            self.sessions[session_id] = websocket
 
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
 
+        # Fail the requests still waiting on this connection instead of letting them time out
+        for future in self.pending_requests.pop(websocket, {}).values():
+            if not future.done():
+                future.set_exception(ConnectionError("Cockpit disconnected"))
+
+        for session_id in [s for s, ws in self.sessions.items() if ws is websocket]:
+            del self.sessions[session_id]
+
+        self._function_catalogs.pop(websocket, None)
+
+    def get_cockpit(self, session_id: str | None = None) -> WebSocket | None:
+        """Cockpit connection of a session, or the first connected cockpit when no session is given.
+
+        None if the session's cockpit is not connected, so a session never drives another browser's cockpit.
+        """
+        if session_id is not None:
+            return self.sessions.get(session_id)
+        return self.active_connections[0] if self.active_connections else None
+
+    async def get_function_catalog(self, websocket: WebSocket) -> FunctionCatalog:
+        """Function catalog of a cockpit, only fetched with `system.getFunctions` when not cached."""
+        task = self._function_catalogs.get(websocket)
+        if task is None:
+            # Shared by concurrent callers, so the catalog is fetched once
+            task = asyncio.create_task(self._fetch_function_catalog(websocket))
+            self._function_catalogs[websocket] = task
+
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if self._function_catalogs.get(websocket) is task:
+                del self._function_catalogs[websocket]
+            raise
+
+    async def _fetch_function_catalog(self, websocket: WebSocket) -> FunctionCatalog:
+        return FunctionCatalog(await self.send_rpc_request(websocket, "system.getFunctions", {}))
+
     async def send_message(self, websocket: WebSocket, message: dict):
         await websocket.send_text(json.dumps(message))
 
@@ -26,19 +75,26 @@ class ConnectionManager:
         """Handle incoming WebSocket message - dispatch to appropriate handler"""
         try:
             message = json.loads(data)
+            pending = self.pending_requests.get(websocket, {})
 
+            # Responses to a batch request arrive together, as a list. Resolve every one of them
+            if isinstance(message, list):
+                resolved = False
+                for m in message:
+                    resolved |= self._resolve(pending, m)
+                if resolved:
+                    return
             # Check if this is a response to a pending request
-            if "id" in message and message["id"] in self.pending_requests:
-                future = self.pending_requests.pop(message["id"])
-                if "result" in message:
-                    future.set_result(message["result"])
-                elif "error" in message:
-                    future.set_exception(Exception(f"RPC Error: {message['error']}"))
-                else:
-                    future.set_result(None)
-            else:
-                # This is a regular message, echo it back
-                await websocket.send_text(data)
+            if isinstance(message, dict) and self._resolve(pending, message):
+                return
+
+            # Notification that the cockpit functions changed, fetch them again when needed
+            if isinstance(message, dict) and message.get("method") == "system.functionsChanged":
+                self._function_catalogs.pop(websocket, None)
+                return
+
+            # This is a regular message, echo it back
+            await websocket.send_text(data)
 
         except json.JSONDecodeError:
             error_response = {
@@ -48,6 +104,24 @@ class ConnectionManager:
             }
             await self.send_message(websocket, error_response)
 
+    @staticmethod
+    def _resolve(pending: dict[int, asyncio.Future], message: Any) -> bool:
+        """Complete the future of a pending request with its response, if there is one."""
+        if not isinstance(message, dict) or message.get("id") not in pending:
+            return False
+
+        future = pending.pop(message["id"])
+        if future.done():
+            # Already timed out
+            return True
+        if "result" in message:
+            future.set_result(message["result"])
+        elif "error" in message:
+            future.set_exception(Exception(f"RPC Error: {message['error']}"))
+        else:
+            future.set_result(None)
+        return True
+
     async def send_rpc_request(
         self,
         websocket: WebSocket,
@@ -59,12 +133,15 @@ class ConnectionManager:
         if params is None:
             params = {}
         if request_id is None:
-            # Generate a unique request ID
-            request_id = id(params) + int(asyncio.get_event_loop().time() * 1000000)
+            request_id = next(self._request_ids)
+
+        pending = self.pending_requests.get(websocket)
+        if pending is None:
+            raise ConnectionError("Cockpit is not connected")
 
         # Create a Future to wait for the response
-        future = asyncio.Future()
-        self.pending_requests[request_id] = future
+        future = asyncio.get_running_loop().create_future()
+        pending[request_id] = future
 
         message = {
             "jsonrpc": "2.0",
@@ -79,10 +156,45 @@ class ConnectionManager:
             result = await asyncio.wait_for(future, timeout=2.0)
             return result
         except asyncio.TimeoutError:
-            # Clean up the pending request
-            self.pending_requests.pop(request_id, None)
             raise Exception("Request timeout")
-        except Exception as e:
+        finally:
             # Clean up the pending request
-            self.pending_requests.pop(request_id, None)
-            raise e
+            pending.pop(request_id, None)
+
+    async def send_rpc_batch(
+        self,
+        websocket: WebSocket,
+        calls: list[tuple[str, dict | None]],
+        timeout: float = 2.0,
+    ) -> list[Any]:
+        """Send several JSON-RPC requests as one batch and wait for all the responses.
+
+        The cockpit executes a batch in order. Results are returned in request order, with
+        an exception in place of each request that failed or timed out.
+        """
+        pending = self.pending_requests.get(websocket)
+        if pending is None:
+            raise ConnectionError("Cockpit is not connected")
+
+        loop = asyncio.get_running_loop()
+        request_ids = [next(self._request_ids) for _ in calls]
+        futures = [loop.create_future() for _ in calls]
+        pending.update(zip(request_ids, futures))
+
+        message = [
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}}
+            for request_id, (method, params) in zip(request_ids, calls)
+        ]
+
+        try:
+            await websocket.send_text(json.dumps(message))
+            await asyncio.wait(futures, timeout=timeout)
+            return [
+                (future.exception() or future.result()) if future.done() else Exception("Request timeout")
+                for future in futures
+            ]
+        finally:
+            # Clean up the pending requests
+            for request_id, future in zip(request_ids, futures):
+                pending.pop(request_id, None)
+                future.cancel()
@@ -0,0 +1,39 @@
+import re
+from collections import defaultdict
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+class FunctionCatalog:
+    """Function definitions of a cockpit, indexed for search.
+
+    Every substring of the function names and every prefix of the description words is
+    indexed once, so a search is a dictionary lookup instead of a scan of the catalog.
+    """
+
+    def __init__(self, functions: list[dict]):
+        self.functions = functions
+
+        self._name_substrings: dict[str, set[int]] = defaultdict(set)
+        self._description_prefixes: dict[str, set[int]] = defaultdict(set)
+        for i, function in enumerate(functions):
+            name = function["name"].lower()
+            for start in range(len(name)):
+                for end in range(start + 1, len(name) + 1):
+                    self._name_substrings[name[start:end]].add(i)
+
+            for word in _WORD.findall(function.get("description", "").lower()):
+                for end in range(1, len(word) + 1):
+                    self._description_prefixes[word[:end]].add(i)
+
+    def search(self, query: str) -> list[dict]:
+        """Functions whose name contains the query, then those with a description word starting with it.
+
+        Case-insensitive, in catalog order within each group.
+        """
+        query = query.lower()
+        name_matches = self._name_substrings.get(query, set())
+        description_matches = self._description_prefixes.get(query, set()) - name_matches
+        return [self.functions[i] for i in sorted(name_matches)] + [
+            self.functions[i] for i in sorted(description_matches)
+        ]
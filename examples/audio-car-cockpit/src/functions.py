@@ -10,12 +10,13 @@ def create_functions_router(manager: ConnectionManager) -> APIRouter:
     """Create and configure the functions API router."""
 
     @router.get("/functions.json")
-    async def get_functions():
+    async def get_functions(session: str | None = None):
         """
         Get all available cockpit functions in JSON format.
-        Fetches definitions from the frontend via WebSocket.
+        Fetches definitions from the frontend via WebSocket, then serves them from cache.
         """
-        if not manager.active_connections:
+        ws = manager.get_cockpit(session)
+        if ws is None:
             return JSONResponse(
                 status_code=503,
                 content={
@@ -24,11 +25,9 @@ def create_functions_router(manager: ConnectionManager) -> APIRouter:
                 },
             )
 
-        ws = manager.active_connections[0]
-
         try:
-            functions = await manager.send_rpc_request(ws, "system.getFunctions", {})
-            return JSONResponse(content={"functions": functions})
+            catalog = await manager.get_function_catalog(ws)
+            return JSONResponse(content={"functions": catalog.functions})
         except Exception as e:
             return JSONResponse(
                 status_code=500,
@@ -36,15 +35,18 @@ def create_functions_router(manager: ConnectionManager) -> APIRouter:
             )
 
     @router.get("/debug/get-functions-matching/{query}")
-    async def debug_get_functions_matching(query: str):
+    async def debug_get_functions_matching(query: str, session: str | None = None):
         """
         Debug endpoint: Search for functions matching a query string.
         Prints results to terminal and returns JSON response.
 
         Args:
-            query: Search string to match against function names (case-insensitive)
+            query: Search string to match against function names, or the start of words in
+                their descriptions (case-insensitive)
+            session: Browser session of the cockpit to query, defaults to the first connected one
         """
-        if not manager.active_connections:
+        ws = manager.get_cockpit(session)
+        if ws is None:
             print("\n[DEBUG] No active connections. Please open the UI in a browser first.\n")
             return JSONResponse(
                 status_code=503,
@@ -54,15 +56,10 @@ def create_functions_router(manager: ConnectionManager) -> APIRouter:
                 },
             )
 
-        ws = manager.active_connections[0]
-
         try:
-            # Fetch all functions from the frontend
-            all_functions = await manager.send_rpc_request(ws, "system.getFunctions", {})
-
-            # Filter functions whose name contains the query (case-insensitive)
-            query_lower = query.lower()
-            matching = [f for f in all_functions if query_lower in f["name"].lower()]
+            # Cached functions of the frontend, name matches first
+            catalog = await manager.get_function_catalog(ws)
+            matching = catalog.search(query)
 
             # Print to terminal
             print("\n" + "=" * 80)
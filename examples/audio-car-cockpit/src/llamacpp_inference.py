@@ -1,18 +1,17 @@
 import ast
+import asyncio
 import json
-import signal
-import subprocess
-from collections.abc import Generator
-from contextlib import contextmanager
+import re
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from time import sleep
-from typing import AsyncGenerator, overload
+from typing import Literal, overload
 
 import httpx
 from httpx_retries import Retry, RetryTransport
 
-from src.utils import find_available_port
+from src.tool_retriever import ToolRetriever
 
 
 def _get_func_name(node: ast.expr):
@@ -54,97 +53,82 @@ def function_to_args(call_str: str) -> tuple[str, dict]:
     return func_name, args
 
 
-def spawn_embedding_runtime(
-    file_name: str | Path,
-) -> tuple[subprocess.Popen, int]:
-    """Spawns the llama-server process."""
-
-    port = find_available_port(preferred_port=8989)
-    host = "127.0.0.1"
-    executable = str((Path.cwd() / "llama-server").resolve())
-
-    command = [
-        executable,
-        "--host",
-        host,
-        "--port",
-        str(port),
-        "--log-disable",
-        "--no-perf",
-        "--n-gpu-layers",
-        "9999",
-        "--mlock",
-        "--ctx-size",
-        "2048",
-        # Special tokens output enabled
-        "--special",
-        "-hf",
-        str(file_name),
-    ]
-
-    try:
-        # Use Popen for non-blocking execution
-        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True)
-
-    except FileNotFoundError:
-        raise FileNotFoundError(f"{executable} command not found. Please ensure it is installed and in your PATH.")
-
-    # Wait for server to be ready
-    print(f"Waiting for {executable} to start, serving {file_name}...")
-    # https://github.com/ggml-org/llama.cpp/tree/master/tools/server#api-endpoints
-    health_url = f"http://{host}:{port}/health"
-    _tries, _sleep = 300, 0.5
-    for _ in range(_tries):
-        try:
-            r = httpx.get(health_url, timeout=1.0)
-            if r.status_code == 200:
-                break
-        except httpx.HTTPError:
-            pass
-        sleep(_sleep)
-    else:
-        process.terminate()
-        stdout, stderr = process.communicate()
-        raise RuntimeError(
-            f"{executable} failed to become healthy after {_tries * _sleep:.1f}s.\n"
-            f"Stdout: {stdout.decode(errors='ignore')}\n"
-            f"Stderr: {stderr.decode(errors='ignore')}"
-        )
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
 
-    if process.poll() is not None:  # Process terminated prematurely
-        stdout, stderr = process.communicate()
-        raise RuntimeError(
-            f"{executable} failed to start. Return code: {process.returncode}\n"
-            f"Stdout: {stdout.decode(errors='ignore')}\n"
-            f"Stderr: {stderr.decode(errors='ignore')}"
-        )
 
-    print(f"`{executable}` running on port {port} (PID: {process.pid})")
-    return process, port
+async def parse_tool_call_stream(
+    pieces: AsyncIterable[str],
+) -> AsyncGenerator[tuple[Literal["tool_call", "sentence"], str]]:
+    """Split streamed tool model output into its tool call and response sentences.
 
+    The tool call is yielded as soon as `<|tool_call_end|>` is seen, and each sentence of
+    the response as soon as it is complete, so later stages can start before generation ends.
 
-@contextmanager
-def spawn_server(
-    file_name: str | Path,
-) -> Generator[tuple[subprocess.Popen, int], None, None]:
-    embedding_process, embedding_port = spawn_embedding_runtime(file_name)
-    try:
-        yield embedding_process, embedding_port
-    finally:
-        embedding_process.terminate()
-        try:
-            # Wait for graceful shutdown
-            embedding_process.wait(timeout=4)
-            print("llama-server terminated gracefully.")
-        except subprocess.TimeoutExpired:
-            try:
-                # One more chance
-                embedding_process.send_signal(signal.SIGTERM)
-                embedding_process.wait(timeout=4)
-            except subprocess.TimeoutExpired:
-                print("llama-server did not terminate in time, killing...")
-                embedding_process.kill()
-                embedding_process.wait()
+    Example:
+    "<|tool_call_start|>[media.next()]<|tool_call_end|>Next song. Enjoy!<|im_end|>"
+    ->
+    ("tool_call", "media.next()"), ("sentence", "Next song."), ("sentence", "Enjoy!")
+    """
+
+    buffer = ""
+    in_tool_call = False
+    async for piece in pieces:
+        buffer = (buffer + piece).replace("<|im_end|>", "")
+
+        if not in_tool_call and "<|tool_call_start|>" in buffer:
+            _, buffer = buffer.split("<|tool_call_start|>", maxsplit=1)
+            in_tool_call = True
+        if in_tool_call:
+            if "<|tool_call_end|>" not in buffer:
+                continue
+            tool_call, buffer = buffer.split("<|tool_call_end|>", maxsplit=1)
+            in_tool_call = False
+            yield "tool_call", tool_call.strip().lstrip("[").rstrip("]")
+
+        # Hold back a special token that may still be incomplete
+        special_start = buffer.rfind("<|")
+        held_back = buffer[special_start:] if special_start != -1 and "|>" not in buffer[special_start:] else ""
+        text = buffer[: len(buffer) - len(held_back)]
+
+        *sentences, rest = _SENTENCE_END.split(text)
+        for sentence in sentences:
+            if sentence.strip():
+                yield "sentence", sentence.strip()
+        buffer = rest + held_back
+
+    if in_tool_call:
+        # Unterminated tool call, let the caller report it
+        yield "tool_call", buffer.strip().lstrip("[").rstrip("]")
+    elif buffer.strip():
+        yield "sentence", buffer.strip()
+
+
+@dataclass(kw_only=True)
+class CompletionStats:
+    """Token counts and timings of a single completion, from llama-server's `timings`."""
+
+    prefill_tokens: int
+    cached_tokens: int
+    decode_tokens: int
+    prefill_ms: float
+    decode_ms: float
+
+    @classmethod
+    def from_response(cls, response: dict) -> "CompletionStats":
+        timings = response.get("timings", {})
+        return cls(
+            prefill_tokens=timings.get("prompt_n", 0),
+            cached_tokens=timings.get("cache_n", 0),
+            decode_tokens=timings.get("predicted_n", 0),
+            prefill_ms=timings.get("prompt_ms", 0.0),
+            decode_ms=timings.get("predicted_ms", 0.0),
+        )
+
+    def __str__(self) -> str:
+        return (
+            f"prefill {self.prefill_tokens} tokens ({self.cached_tokens} cached) in {self.prefill_ms:.0f}ms, "
+            f"decode {self.decode_tokens} tokens in {self.decode_ms:.0f}ms"
+        )
 
 
 @dataclass(kw_only=True)
@@ -152,13 +136,36 @@ class ToolCallingRuntime:
     port: int
     host: str = "localhost"
     max_tokens: int = 4096
+    # Requests sent concurrently, should match the llama-server `--parallel` slots
+    parallel: int = 1
+    # Only send the k most relevant functions per request, 0 sends the whole catalog
+    top_k_tools: int = 0
 
     def __post_init__(self):
-        self.client = httpx.Client(transport=RetryTransport(retry=Retry(total=3, backoff_factor=0.1)))
+        # Shared by all handlers, so connections to llama-server are pooled and reused
+        # Limits go on the wrapped transport, httpx ignores client `limits` with a custom transport
+        self.client = httpx.AsyncClient(
+            transport=RetryTransport(
+                transport=httpx.AsyncHTTPTransport(
+                    limits=httpx.Limits(max_connections=self.parallel, max_keepalive_connections=self.parallel)
+                ),
+                retry=Retry(total=3, backoff_factor=0.1),
+            ),
+        )
+        # Each request is pinned to a free llama-server slot, extra requests wait here.
+        # Slots only ever see our prompts, so the tool-list prefix stays in their KV cache.
+        self._free_slots: asyncio.Queue[int] = asyncio.Queue()
+        for id_slot in range(self.parallel):
+            self._free_slots.put_nowait(id_slot)
+        # Requests running or waiting for a slot, for least-busy routing between replicas
+        self.in_flight = 0
+        # Set once warmed up, cleared while its llama-server restarts
+        self.ready = False
 
         self.default_completion_params: dict[str, float | int | bool] = {
             "temperature": 0.0,
             "n_predict": 512,
+            "cache_prompt": True,
         }
 
         path_functions_def: Path = Path(__file__).parent.parent / "functions.json"
@@ -169,33 +176,104 @@ class ToolCallingRuntime:
         # Prepare as a string with a flat layout
         self.all_functions_no_indent: str = json.dumps(self.list_functions, indent=2, ensure_ascii=False)
 
+        # Indexed once, prompts then scale with `top_k_tools` instead of the catalog size
+        self.tool_retriever = ToolRetriever(self.list_functions) if self.top_k_tools > 0 else None
+
+        self._last_messages: list[dict] = []
+        # Rendered chat template around the tool list and user turn, see `_render_template_parts`
+        self._template_parts: tuple[str, str, str] | None = None
+
+    @staticmethod
+    def _build_system_prompt(functions_json: str) -> str:
         _instructions = (
             """If you call a function, also output a brief message for the user. The message should be concise."""
         )
 
-        self.system_prompt = f"""List of tools:
+        return f"""List of tools:
 
-<|tool_list_start|>{self.all_functions_no_indent}<|tool_list_end|>
+<|tool_list_start|>{functions_json}<|tool_list_end|>
 
 {_instructions}"""
 
-        self._last_messages: list[dict] = []
-
-        # Warmup
+    async def warmup(self):
         print("Inference warming...", end=" ")
-        _ = self.completion("Turn on the audio.")
+        await self._pin_prompt_prefix()
+        _ = await self.completion("Turn on the audio.")
+        self.ready = True
         print("Done")
 
-    def __del__(self):
-        self.client.close()
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[int]:
+        self.in_flight += 1
+        try:
+            id_slot = await self._free_slots.get()
+            try:
+                yield id_slot
+            finally:
+                self._free_slots.put_nowait(id_slot)
+        finally:
+            self.in_flight -= 1
+
+    async def _prefill(self, id_slot: int, prompt: str):
+        response = await self.client.post(
+            f"http://{self.host}:{self.port}/completion",
+            json=self.default_completion_params | {"prompt": prompt, "n_predict": 1, "id_slot": id_slot},
+            headers={"Content-Type": "application/json"},
+            timeout=120.0,
+        )
+        response.raise_for_status()
+
+    async def _pin_prompt_prefix(self):
+        """Prefill the system prompt prefix once and share its KV cache with every slot.
 
-    def _apply_template(self, content: str) -> str:
-        response = self.client.post(
+        The KV cache of the first slot is saved and restored into the others, which needs
+        llama-server to run with `--slot-save-path`. Otherwise, each slot is prefilled.
+        """
+        if self._template_parts is None:
+            self._template_parts = await self._render_template_parts()
+        head, middle, _ = self._template_parts
+
+        # With tool retrieval, only the part before the tool list is shared by all prompts
+        prefix = head if self.tool_retriever is not None else head + self.all_functions_no_indent + middle
+
+        await self._prefill(0, prefix)
+        if self.parallel == 1:
+            return
+
+        base_url = f"http://{self.host}:{self.port}"
+        filename = {"filename": f"tool_prefix_{self.port}.bin"}
+        try:
+            response = await self.client.post(f"{base_url}/slots/0?action=save", json=filename, timeout=30.0)
+            response.raise_for_status()
+            responses = await asyncio.gather(
+                *(
+                    self.client.post(f"{base_url}/slots/{id_slot}?action=restore", json=filename, timeout=30.0)
+                    for id_slot in range(1, self.parallel)
+                )
+            )
+            for response in responses:
+                response.raise_for_status()
+        except httpx.HTTPStatusError:
+            # Slot saving is disabled
+            await asyncio.gather(*(self._prefill(id_slot, prefix) for id_slot in range(1, self.parallel)))
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def _render_template_parts(self) -> tuple[str, str, str]:
+        """Render the chat template once around placeholder tool list and user turn.
+
+        Every prompt is then `head + tool list + middle + content + tail`, and the
+        `/apply-template` round trip is only needed at startup.
+        """
+        tools_placeholder = "<|tool_list_placeholder|>"
+        content_placeholder = "<|user_content_placeholder|>"
+        response = await self.client.post(
             f"http://{self.host}:{self.port}/apply-template",
             json={
                 "messages": [
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": content},
+                    {"role": "system", "content": self._build_system_prompt(tools_placeholder)},
+                    {"role": "user", "content": content_placeholder},
                 ]
             },
             headers={"Content-Type": "application/json"},
@@ -203,74 +281,143 @@ class ToolCallingRuntime:
         )
         response.raise_for_status()
         formatted_prompt: str = response.json().get("prompt")
-        return formatted_prompt
+        head, rest = formatted_prompt.split(tools_placeholder)
+        middle, tail = rest.split(content_placeholder)
+        return head, middle, tail
 
-    def _completion(self, content: str) -> tuple[str | None, str]:
-        formatted_prompt = self._apply_template(content)
+    async def _apply_template(self, content: str) -> str:
+        if self._template_parts is None:
+            self._template_parts = await self._render_template_parts()
+        head, middle, tail = self._template_parts
 
-        response = self.client.post(
-            f"http://{self.host}:{self.port}/completion",
-            json=self.default_completion_params
-            | {
-                "prompt": formatted_prompt,
-            },
-            headers={"Content-Type": "application/json"},
-            timeout=30.0,
-        )
+        if self.tool_retriever is None:
+            functions_json = self.all_functions_no_indent
+        else:
+            functions = self.tool_retriever.search(content, self.top_k_tools)
+            functions_json = json.dumps(functions, indent=2, ensure_ascii=False)
+
+        return head + functions_json + middle + content + tail
+
+    async def _completion(self, content: str) -> tuple[str | None, str, CompletionStats]:
+        formatted_prompt = await self._apply_template(content)
+
+        async with self._slot() as id_slot:
+            response = await self.client.post(
+                f"http://{self.host}:{self.port}/completion",
+                json=self.default_completion_params
+                | {
+                    "prompt": formatted_prompt,
+                    "id_slot": id_slot,
+                },
+                headers={"Content-Type": "application/json"},
+                timeout=30.0,
+            )
         response.raise_for_status()
         j = response.json()
         rez: str = j.get("content")
+        stats = CompletionStats.from_response(j)
 
         # Separate tool call and response
         if "<|tool_call_start|>" not in rez:
             rez = rez.rstrip("<|im_end|>")
-            return None, rez
+            return None, rez, stats
 
         rez = rez.split("<|tool_call_start|>", maxsplit=1)[1]
         tool_call, text = rez.split("<|tool_call_end|>", maxsplit=1)
         tool_call = tool_call.lstrip("[").rstrip("]")
         text = text.rstrip("<|im_end|>")
 
-        return tool_call, text
+        return tool_call, text, stats
 
-    async def _completion_stream(self, content: str) -> AsyncGenerator[str, None]:
-        """SSE response
+    async def _completion_stream(self, content: str) -> AsyncGenerator[str]:
+        """SSE response, yielding the content of each event
 
         https://html.spec.whatwg.org/multipage/server-sent-events.html
         """
 
-        formatted_prompt = self._apply_template(content)
+        formatted_prompt = await self._apply_template(content)
 
-        async with httpx.AsyncClient() as aclient:
-            async with aclient.stream(
+        async with self._slot() as id_slot:
+            async with self.client.stream(
                 "post",
                 f"http://{self.host}:{self.port}/completion",
                 json=self.default_completion_params
                 | {
                     "prompt": formatted_prompt,
+                    "id_slot": id_slot,
                     "stream": True,
                 },
                 headers={"Content-Type": "application/json"},
                 timeout=30.0,
             ) as r:
-                async for x in r.aiter_text():
-                    yield x
+                r.raise_for_status()
+                async for line in r.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = json.loads(line.removeprefix("data:"))
+                    if data.get("content"):
+                        yield data["content"]
+                    if data.get("stop"):
+                        print(f"Tool calling: {CompletionStats.from_response(data)}")
+
+    async def completion_with_stats(self, content: str) -> tuple[str | None, str, CompletionStats]:
+        """Like `completion`, also returning prefill/decode token counts to check prompt cache hits."""
+        try:
+            return await self._completion(content)
+        except httpx.HTTPStatusError as e:
+            print(f"Failed on:\n{content}\n{e}")
+            raise
+
+    async def _completion_logged(self, content: str) -> tuple[str | None, str]:
+        tool_call, text, _ = await self.completion_with_stats(content)
+        return tool_call, text
 
     @overload
     def completion(
         self,
         content: str,
-    ) -> tuple[str | None, str]: ...
+    ) -> Awaitable[tuple[str | None, str]]: ...
 
     @overload
-    def completion(self, content: str, stream: bool = True) -> AsyncGenerator[str, None]: ...
+    def completion(self, content: str, stream: bool = True) -> AsyncGenerator[str]: ...
 
-    def completion(self, content: str, stream: bool = False) -> tuple[str | None, str] | AsyncGenerator[str, None]:
-        try:
-            if stream:
-                return self._completion_stream(content)
-            else:
-                return self._completion(content)
-        except httpx.HTTPStatusError as e:
-            print(f"Failed on:\n{content}\n{e}")
-            raise
+    def completion(
+        self, content: str, stream: bool = False
+    ) -> Awaitable[tuple[str | None, str]] | AsyncGenerator[str]:
+        if stream:
+            return self._completion_stream(content)
+        else:
+            return self._completion_logged(content)
+
+
+class ToolCallingRouter:
+    """Sends each request to the least busy ready runtime, one runtime per llama-server replica."""
+
+    def __init__(self, runtimes: list[ToolCallingRuntime]):
+        assert runtimes, "At least one runtime is needed"
+        self.runtimes = runtimes
+
+    def _pick(self) -> ToolCallingRuntime:
+        # While every replica restarts, queue on one of them rather than failing right away
+        candidates = [r for r in self.runtimes if r.ready] or self.runtimes
+        return min(candidates, key=lambda r: r.in_flight)
+
+    async def completion_with_stats(self, content: str) -> tuple[str | None, str, CompletionStats]:
+        return await self._pick().completion_with_stats(content)
+
+    @overload
+    def completion(
+        self,
+        content: str,
+    ) -> Awaitable[tuple[str | None, str]]: ...
+
+    @overload
+    def completion(self, content: str, stream: bool = True) -> AsyncGenerator[str]: ...
+
+    def completion(
+        self, content: str, stream: bool = False
+    ) -> Awaitable[tuple[str | None, str]] | AsyncGenerator[str]:
+        return self._pick().completion(content, stream=stream)
+
+    async def aclose(self):
+        await asyncio.gather(*(runtime.aclose() for runtime in self.runtimes))
@@ -0,0 +1,195 @@
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.utils import is_port_in_use
+
+# Logged by llama-server once the model is loaded and requests are served
+# https://github.com/ggml-org/llama.cpp/tree/master/tools/server
+_READY_PATTERN = re.compile(r"server is listening on|starting the main loop")
+
+
+@dataclass(kw_only=True)
+class ServerReplica:
+    index: int
+    port: int
+    process: subprocess.Popen | None = None
+    ready: bool = False
+    # Crashes since the replica was last ready
+    restarts: int = 0
+    # Set once the replica is ready, or exited while starting
+    startup_done: threading.Event = field(default_factory=threading.Event)
+    # Last log lines, to report why it failed
+    log_tail: deque[str] = field(default_factory=lambda: deque(maxlen=50))
+
+
+class ServerSupervisor:
+    """Runs `replicas` llama-server processes on consecutive ports, restarting crashed ones.
+
+    Readiness is read from each process log as it is written, instead of polling `/health`,
+    and all replicas load the model at the same time, so startup takes a single model load.
+    """
+
+    def __init__(
+        self,
+        file_name: str | Path,
+        replicas: int = 1,
+        parallel: int = 1,
+        slot_save_path: Path | None = None,
+        preferred_port: int = 8989,
+        startup_timeout: float = 600.0,
+        on_ready: Callable[[ServerReplica], None] | None = None,
+        on_exit: Callable[[ServerReplica], None] | None = None,
+    ):
+        self.file_name = file_name
+        self.parallel = parallel
+        self.slot_save_path = slot_save_path
+        self.startup_timeout = startup_timeout
+        # Called from the log reader threads, e.g. to warm up a restarted replica
+        self.on_ready = on_ready
+        self.on_exit = on_exit
+
+        self.host = "127.0.0.1"
+        self.executable = str((Path.cwd() / "llama-server").resolve())
+        # Share the cores between replicas instead of oversubscribing them
+        self.threads = max(1, (os.cpu_count() or 1) // replicas)
+
+        self.replicas: list[ServerReplica] = []
+        port = preferred_port
+        for index in range(replicas):
+            while is_port_in_use(port, self.host):
+                port += 1
+            self.replicas.append(ServerReplica(index=index, port=port))
+            port += 1
+
+        self._started = False
+        self._stopping = False
+
+    def _command(self, replica: ServerReplica) -> list[str]:
+        return [
+            self.executable,
+            "--host",
+            self.host,
+            "--port",
+            str(replica.port),
+            "--no-perf",
+            "--threads",
+            str(self.threads),
+            "--n-gpu-layers",
+            "9999",
+            "--mlock",
+            # The context is split between slots, keep 2048 tokens per slot
+            "--ctx-size",
+            str(2048 * self.parallel),
+            "--parallel",
+            str(self.parallel),
+            *(["--slot-save-path", str(self.slot_save_path)] if self.slot_save_path is not None else []),
+            # Special tokens output enabled
+            "--special",
+            "-hf",
+            str(self.file_name),
+        ]
+
+    def _spawn(self, replica: ServerReplica):
+        replica.ready = False
+        replica.startup_done.clear()
+        try:
+            # Logs are merged into stdout and read line by line, see `_watch`
+            replica.process = subprocess.Popen(
+                self._command(replica),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="ignore",
+                start_new_session=True,
+            )
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"{self.executable} command not found. Please ensure it is installed and in your PATH."
+            )
+
+        threading.Thread(target=self._watch, args=(replica, replica.process), daemon=True).start()
+
+    def _watch(self, replica: ServerReplica, process: subprocess.Popen):
+        """Follow the log of a replica process: mark it ready, and restart it if it crashes."""
+        assert process.stdout is not None
+        # Keep reading even once ready, so the pipe never fills up and blocks the server
+        for line in process.stdout:
+            replica.log_tail.append(line.rstrip())
+            if not replica.ready and _READY_PATTERN.search(line):
+                replica.ready = True
+                # Back to the shortest backoff, only consecutive crashes back off further
+                replica.restarts = 0
+                replica.startup_done.set()
+                print(f"`{self.executable}` replica {replica.index} running on port {replica.port} (PID: {process.pid})")
+                if self._started and self.on_ready is not None:
+                    self.on_ready(replica)
+
+        process.wait()
+        was_ready = replica.ready
+        replica.ready = False
+        replica.startup_done.set()
+        if self._stopping or not self._started:
+            return
+
+        print(f"llama-server replica {replica.index} exited with code {process.returncode}, restarting...")
+        if was_ready and self.on_exit is not None:
+            self.on_exit(replica)
+        replica.restarts += 1
+        # Back off when it keeps crashing
+        time.sleep(min(2.0**replica.restarts, 30.0))
+        if not self._stopping:
+            self._spawn(replica)
+
+    def start(self):
+        """Start all the replicas and wait until every one has loaded the model."""
+        print(f"Waiting for {len(self.replicas)} {self.executable} replica(s) to start, serving {self.file_name}...")
+        for replica in self.replicas:
+            self._spawn(replica)
+
+        deadline = time.monotonic() + self.startup_timeout
+        for replica in self.replicas:
+            if not replica.startup_done.wait(max(0.0, deadline - time.monotonic())) or not replica.ready:
+                assert replica.process is not None
+                code = replica.process.poll()
+                self.stop()
+                reason = f"exited with code {code}" if code is not None else f"not ready after {self.startup_timeout:.0f}s"
+                log = "\n".join(replica.log_tail)
+                raise RuntimeError(f"{self.executable} replica {replica.index} {reason}.\nLog:\n{log}")
+
+        self._started = True
+
+    def stop(self):
+        self._stopping = True
+        for replica in self.replicas:
+            if replica.process is None:
+                continue
+            process = replica.process
+            process.terminate()
+            try:
+                # Wait for graceful shutdown
+                process.wait(timeout=4)
+                print("llama-server terminated gracefully.")
+            except subprocess.TimeoutExpired:
+                try:
+                    # One more chance
+                    process.send_signal(signal.SIGTERM)
+                    process.wait(timeout=4)
+                except subprocess.TimeoutExpired:
+                    print("llama-server did not terminate in time, killing...")
+                    process.kill()
+                    process.wait()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -7,6 +7,12 @@ class PydanticSettings(BaseSettings, case_sensitive=False):
 
     DEMO_URL: HttpUrl
     AUDIO_SERVER_PORT: int
+    # Tool calling requests decoded concurrently by llama-server
+    TOOL_SERVER_PARALLEL: int = 2
+    # llama-server processes for tool calling, e.g. one per CPU socket
+    TOOL_SERVER_REPLICAS: int = 1
+    # Number of functions retrieved per request for the tool list, 0 sends all of them
+    TOOL_RETRIEVAL_TOP_K: int = 0
 
 
 p_env = PydanticSettings()  # type:ignore[reportCallIssue]
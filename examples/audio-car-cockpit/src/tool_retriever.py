@@ -0,0 +1,79 @@
+import math
+import re
+from collections import Counter
+
+_CAMEL_CASE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_SUFFIXES = ("ations", "ation", "ings", "ing", "ions", "ion", "ates", "ate", "es", "s", "e")
+
+
+def _stem(word: str) -> str:
+    """Strip a common English suffix, so that e.g. "navigate" and "navigation" match."""
+
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+    return word
+
+
+def _tokenize(text: str) -> list[str]:
+    """Lowercase stemmed words, splitting camelCase and dotted names.
+
+    Example:
+    "carWindows.openAll" -> ["car", "window", "open", "all"]
+    """
+
+    words = _NON_ALNUM.split(_CAMEL_CASE.sub(" ", text).lower())
+    return [_stem(w) for w in words if w]
+
+
+def _function_text(function: dict) -> str:
+    """Searchable text of a function: name, description, parameter names, descriptions and enums."""
+
+    parts = [function["name"], function.get("description", "")]
+    for name, spec in function.get("parameters", {}).get("properties", {}).items():
+        parts.append(name)
+        parts.append(spec.get("description", ""))
+        parts.extend(str(v) for v in spec.get("enum", []))
+    return " ".join(parts)
+
+
+class ToolRetriever:
+    """BM25 index over a function catalog, to select the tools relevant to an utterance.
+
+    https://en.wikipedia.org/wiki/Okapi_BM25
+    """
+
+    def __init__(self, functions: list[dict], k1: float = 1.5, b: float = 0.75):
+        self.functions = functions
+        self.k1 = k1
+        self.b = b
+
+        self._term_freqs: list[Counter[str]] = [Counter(_tokenize(_function_text(f))) for f in functions]
+        self._doc_lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_doc_length = sum(self._doc_lengths) / max(len(functions), 1)
+
+        doc_freqs = Counter(term for tf in self._term_freqs for term in tf)
+        n = len(functions)
+        self._idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freqs.items()}
+
+    def scores(self, query: str) -> list[float]:
+        """BM25 score of every function for the query, in catalog order."""
+
+        query_terms = [t for t in set(_tokenize(query)) if t in self._idf]
+        scores = []
+        for tf, doc_length in zip(self._term_freqs, self._doc_lengths):
+            norm = self.k1 * (1 - self.b + self.b * doc_length / self._avg_doc_length)
+            scores.append(sum(self._idf[t] * tf[t] * (self.k1 + 1) / (tf[t] + norm) for t in query_terms if t in tf))
+        return scores
+
+    def search(self, query: str, top_k: int) -> list[dict]:
+        """Top-k functions for the query.
+
+        Returned in catalog order rather than score order, so prompts built from similar
+        selections share a longer prefix in the llama-server prompt cache.
+        """
+
+        scores = self.scores(query)
+        best = sorted(range(len(scores)), key=lambda i: (-scores[i], i))[:top_k]
+        return [self.functions[i] for i in sorted(best)]
@@ -3,6 +3,9 @@
     return Math.min(max, Math.max(min, value));
   }
 
+  // Ties this page's audio and cockpit WebSockets together, so voice commands drive this cockpit
+  const SESSION_ID = crypto.randomUUID ? crypto.randomUUID() : Math.random().toString(36).slice(2);
+
   /* ========================================================================
      CAPTION - overlay of the transcribed audio
      ======================================================================== */
@@ -715,27 +718,32 @@
       try {
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
         // Connect to main server's audio endpoint
-        const url = `${protocol}//${window.location.host}/ws-audio`;
+        const url = `${protocol}//${window.location.host}/ws-audio?session=${SESSION_ID}`;
 
         this.audio.audioWs = new WebSocket(url);
+        // Audio travels as binary frames: JSON header + raw bytes, see `encodeAudioFrame`
+        this.audio.audioWs.binaryType = 'arraybuffer';
 
         this.audio.audioWs.onopen = async () => {
-          // Convert to WAV and send
+          // Convert to WAV and send it as is, without base64 encoding
           const wavBlob = await this.convertToWav(this.audio.recordedBlob);
-          const reader = new FileReader();
-          reader.onload = () => {
-            const audioB64 = reader.result.split(',')[1];
-            const payload = {
-              mode: 'asr',
-              audio: audioB64,
-              voice: this.audio.selectedVoice
-            };
-            this.audio.audioWs.send(JSON.stringify(payload));
+          const header = {
+            mode: 'asr',
+            voice: this.audio.selectedVoice
           };
-          reader.readAsDataURL(wavBlob);
+          this.audio.audioWs.send(this.encodeAudioFrame(header, await wavBlob.arrayBuffer()));
         };
 
         this.audio.audioWs.onmessage = (e) => {
+          if (e.data instanceof ArrayBuffer) {
+            const { header, payloadOffset } = this.decodeAudioFrame(e.data);
+            if (header.type === 'audio') {
+              // Queue audio chunk for streaming playback, reading the float32 PCM in place
+              this.queueAudioChunk(new Float32Array(e.data, payloadOffset), header.sample_rate);
+            }
+            return;
+          }
+
           const msg = JSON.parse(e.data);
 
           if (msg.type === 'text') {
@@ -748,9 +756,6 @@
             } else if (msg.role === 'model') {
               this.captions.updateModel(msg.text, msg.tool, msg.tool_valid);
             }
-          } else if (msg.type === 'audio') {
-            // Queue audio chunk for streaming playback
-            this.queueAudioChunk(msg.data, msg.sample_rate);
           } else if (msg.type === 'done') {
             // Server has completed the full pipeline (ASR → Tool Calling → TTS)
             if (this.audio.transcribedText) {
@@ -849,11 +854,25 @@
       return buffer;
     }
 
-    queueAudioChunk(base64Data, sampleRate) {
-      // Decode PCM data
-      const pcmBytes = Uint8Array.from(atob(base64Data), c => c.charCodeAt(0));
-      const floatArray = new Float32Array(pcmBytes.buffer);
+    encodeAudioFrame(header, payload) {
+      // uint32 header length (little endian) | JSON header | payload, mirrors `src/audio_framing.py`
+      const headerBytes = new TextEncoder().encode(JSON.stringify(header));
+      const padding = (4 - ((4 + headerBytes.length) % 4)) % 4;
+      const frame = new Uint8Array(4 + headerBytes.length + padding + payload.byteLength);
+      new DataView(frame.buffer).setUint32(0, headerBytes.length + padding, true);
+      frame.set(headerBytes, 4);
+      frame.fill(0x20, 4 + headerBytes.length, 4 + headerBytes.length + padding);
+      frame.set(new Uint8Array(payload), 4 + headerBytes.length + padding);
+      return frame.buffer;
+    }
 
+    decodeAudioFrame(buffer) {
+      const headerLength = new DataView(buffer).getUint32(0, true);
+      const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 4, headerLength)));
+      return { header, payloadOffset: 4 + headerLength };
+    }
+
+    queueAudioChunk(floatArray, sampleRate) {
       // Calculate chunk duration in seconds
       const durationSec = floatArray.length / sampleRate;
 
@@ -940,9 +959,9 @@
       }
     }
 
-    playAudio(base64Data, sampleRate) {
+    playAudio(floatArray, sampleRate) {
       // Legacy method for compatibility - now uses queue
-      this.queueAudioChunk(base64Data, sampleRate);
+      this.queueAudioChunk(floatArray, sampleRate);
     }
 
     audioTerminate() {
@@ -1195,7 +1214,7 @@
     connect(onMessage) {
       this.messageHandler = onMessage;
       const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-      const url = `${protocol}//${window.location.host}/ws`;
+      const url = `${protocol}//${window.location.host}/ws?session=${SESSION_ID}`;
 
       this.ws = new WebSocket(url);
       this.ws.onopen = () => this.onOpen();
@@ -1384,13 +1403,19 @@
 
   function handleRpcMessage(message) {
     // Handle incoming JSON-RPC messages
-    if (message.method) {
+    if (Array.isArray(message)) {
+      // Batch: execute in order, answer all requests in a single message
+      const responses = message.map(executeRpcRequest).filter(response => response !== null);
+      if (responses.length > 0) {
+        wsClient.send(responses);
+      }
+    } else if (message.method) {
       // This is a request or notification
-      const result = executeCommand(message.method, message.params || {});
+      const response = executeRpcRequest(message);
 
       // If there's an id, send a response
-      if (message.id !== undefined) {
-        wsClient.sendRpcResponse(message.id, result);
+      if (response !== null) {
+        wsClient.send(response);
       }
     } else if (message.result !== undefined || message.error !== undefined) {
       // This is a response to our request
@@ -1398,6 +1423,17 @@
     }
   }
 
+  function executeRpcRequest(message) {
+    // Execute a request, returning its response, or null for a notification
+    let response;
+    try {
+      response = { jsonrpc: '2.0', id: message.id, result: executeCommand(message.method, message.params || {}) };
+    } catch (e) {
+      response = { jsonrpc: '2.0', id: message.id, error: { code: -32601, message: e.message } };
+    }
+    return message.id !== undefined ? response : null;
+  }
+
   function executeCommand(method, params) {
     // Special case: return function definitions
     if (method === 'system.getFunctions') {
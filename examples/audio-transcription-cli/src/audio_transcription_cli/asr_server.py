@@ -0,0 +1,199 @@
+"""Long-lived llama.cpp audio server that keeps the ASR model resident."""
+
+import base64
+import json
+import socket
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+
+from .model_downloader import ModelDownloader
+
+
+def find_available_port(preferred_port: int | None = None) -> int:
+    """Return `preferred_port` if free, otherwise let the OS pick one."""
+    if preferred_port is not None:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            if s.connect_ex(("127.0.0.1", preferred_port)) != 0:
+                return preferred_port
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ASRServer:
+    """
+    Persistent llama-liquid-audio-server process used for transcription.
+
+    The model, mmproj and audio decoder are loaded once when the server starts,
+    and every chunk is sent over a local HTTP connection instead of spawning a
+    new `llama-lfm2-audio` process per chunk.
+    """
+
+    def __init__(
+        self,
+        model_downloader: ModelDownloader,
+        port: int | None = None,
+        parallel: int = 1,
+        startup_timeout: float = 120.0,
+        request_timeout: float = 30.0,
+    ):
+        """
+        Initialize the ASR server handle.
+
+        Args:
+            model_downloader: ModelDownloader object with model paths and settings
+            port: Preferred port for the server (a free port is picked if taken)
+            parallel: Number of requests the server decodes concurrently
+            startup_timeout: Seconds to wait for the model to finish loading
+            request_timeout: Seconds to wait for a single transcription request
+        """
+        self.model_downloader = model_downloader
+        self.preferred_port = port
+        self.parallel = parallel
+        self.startup_timeout = startup_timeout
+        self.request_timeout = request_timeout
+
+        self.host = "127.0.0.1"
+        self.port: int | None = None
+        self._process: subprocess.Popen | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Return the base URL of the running server."""
+        return f"http://{self.host}:{self.port}"
+
+    def is_running(self) -> bool:
+        """Check if the server process is alive."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """
+        Start the server process and block until the model is loaded.
+
+        Raises:
+            FileNotFoundError: If the server binary is not available
+            RuntimeError: If the server fails to become healthy
+        """
+        if self.is_running():
+            return
+
+        self.port = find_available_port(self.preferred_port)
+        cmd = self.model_downloader.get_server_command(
+            self.host, self.port, parallel=self.parallel
+        )
+
+        print("🚀 Starting persistent ASR server...")
+        start_time = time.time()
+        self._process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+        # https://github.com/ggml-org/llama.cpp/tree/master/tools/server#api-endpoints
+        deadline = start_time + self.startup_timeout
+        while time.time() < deadline:
+            if self._process.poll() is not None:
+                code = self._process.returncode
+                self._process = None
+                raise RuntimeError(f"ASR server exited during startup with code {code}")
+            try:
+                with urllib.request.urlopen(f"{self.base_url}/health", timeout=1.0):
+                    print(f"✅ ASR server ready ({time.time() - start_time:.1f}s)")
+                    return
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.25)
+
+        self.stop()
+        raise RuntimeError(
+            f"ASR server failed to become healthy after {self.startup_timeout:.0f}s"
+        )
+
+    def stop(self) -> None:
+        """Terminate the server process."""
+        if self._process is None:
+            return
+
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=4)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+
+    def transcribe_stream(self, wav_bytes: bytes, asr_prompt: str) -> Iterator[str]:
+        """
+        Transcribe an in-memory WAV file, yielding text as it is decoded.
+
+        The server streams server-sent events, one JSON delta per event, so
+        transcript text is never mixed with log output.
+
+        Args:
+            wav_bytes: Encoded WAV file contents
+            asr_prompt: System prompt for the ASR task
+
+        Yields:
+            Pieces of the raw transcription, in order
+
+        Raises:
+            RuntimeError: If the server is not running or the request fails
+        """
+        if not self.is_running():
+            raise RuntimeError("ASR server is not running")
+
+        payload = {
+            "messages": [
+                {"role": "system", "content": asr_prompt},
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "input_audio",
+                            "input_audio": {
+                                "data": base64.b64encode(wav_bytes).decode("utf-8"),
+                                "format": "wav",
+                            },
+                        }
+                    ],
+                },
+            ],
+            "max_tokens": 512,
+            "stream": True,
+        }
+        request = urllib.request.Request(
+            f"{self.base_url}/v1/chat/completions",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+
+        # https://html.spec.whatwg.org/multipage/server-sent-events.html
+        try:
+            with urllib.request.urlopen(request, timeout=self.request_timeout) as r:
+                for raw_line in r:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    data = line.removeprefix("data:").strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or [{}]
+                    content = choices[0].get("delta", {}).get("content")
+                    if content:
+                        yield content
+        except (urllib.error.URLError, OSError) as e:
+            raise RuntimeError(f"ASR server request failed: {e}") from e
+
+    def __enter__(self):
+        """Context manager entry."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit with cleanup."""
+        self.stop()
@@ -1,5 +1,6 @@
 """Audio preprocessing module for LFM2 model compatibility."""
 
+import io
 import tempfile
 from collections.abc import Iterator
 
@@ -30,6 +31,22 @@ def save_raw_audio_as_wav(audio_data: np.ndarray, sample_rate: int = 48000) -> s
     return temp_path
 
 
+def encode_wav_bytes(audio_data: np.ndarray, sample_rate: int) -> bytes:
+    """
+    Encode audio data as an in-memory 16-bit PCM WAV file.
+
+    Args:
+        audio_data: Audio samples
+        sample_rate: Sample rate of the audio data
+
+    Returns:
+        WAV file contents
+    """
+    buffer = io.BytesIO()
+    sf.write(buffer, audio_data, sample_rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+
 class AudioChunker:
     """Handles chunking of audio files for real-time processing."""
 
@@ -57,78 +74,67 @@ class AudioChunker:
         info = sf.info(audio_file_path)
         return info.duration, info.samplerate, info.frames
 
-    def create_chunks(self, audio_file_path: str) -> Iterator[tuple[str, float, float]]:
+    def iter_audio_chunks(
+        self, audio_file_path: str, read_duration: float = 60.0
+    ) -> Iterator[tuple[np.ndarray, int, float, float]]:
         """
-        Create audio chunks from file with timing information.
+        Yield overlapping in-memory audio chunks with timing information.
+
+        The source file is opened once and decoded in windows of `read_duration`
+        seconds. Chunks are NumPy views into the current window, so overlapping
+        regions are neither re-read from disk nor copied, and memory use stays
+        bounded regardless of the recording length.
 
         Args:
             audio_file_path: Path to audio file
+            read_duration: Seconds of audio decoded per read from disk
 
         Yields:
-            Tuple of (chunk_file_path, start_time, end_time)
-        """
-        # Get audio info
-        total_duration, sample_rate, total_frames = self.get_audio_info(audio_file_path)
-
-        print(f"📊 Audio file: {total_duration:.1f}s, {sample_rate}Hz")
-
-        # Calculate chunk parameters
-        chunk_frames = int(self.chunk_duration * sample_rate)
-        overlap_frames = int(self.overlap * sample_rate)
-        step_frames = chunk_frames - overlap_frames
-
-        current_frame = 0
-        chunk_index = 0
-
-        while current_frame < total_frames:
-            # Calculate chunk boundaries
-            start_frame = current_frame
-            end_frame = min(current_frame + chunk_frames, total_frames)
-
-            # Calculate timing
-            start_time = start_frame / sample_rate
-            end_time = end_frame / sample_rate
-
-            # Read audio chunk
-            audio_chunk, _ = sf.read(
-                audio_file_path, start=start_frame, frames=end_frame - start_frame
-            )
-
-            # Save chunk as temporary file
-            chunk_path = self._save_chunk(audio_chunk, sample_rate, chunk_index)
-
-            yield chunk_path, start_time, end_time
-
-            # Move to next chunk
-            current_frame += step_frames
-            chunk_index += 1
-
-            # Break if we've reached the end
-            if end_frame >= total_frames:
-                break
-
-    def _save_chunk(
-        self, audio_data: np.ndarray, sample_rate: int, chunk_index: int
-    ) -> str:
+            Tuple of (audio_chunk, sample_rate, start_time, end_time)
         """
-        Save audio chunk as temporary WAV file.
-
-        Args:
-            audio_data: Audio data for this chunk
-            sample_rate: Sample rate
-            chunk_index: Index of this chunk
-
-        Returns:
-            Path to temporary chunk file
-        """
-        fd, temp_path = tempfile.mkstemp(
-            suffix=f"_chunk_{chunk_index}.wav", prefix="audio_chunk_"
-        )
-        import os
-
-        os.close(fd)
-
-        # Save chunk
-        sf.write(temp_path, audio_data, sample_rate, subtype="PCM_16")
-
-        return temp_path
+        with sf.SoundFile(audio_file_path) as f:
+            sample_rate = f.samplerate
+            total_frames = f.frames
+
+            # Calculate chunk parameters
+            chunk_frames = int(self.chunk_duration * sample_rate)
+            overlap_frames = int(self.overlap * sample_rate)
+            step_frames = chunk_frames - overlap_frames
+            read_frames = max(int(read_duration * sample_rate), chunk_frames)
+
+            buffer = f.read(read_frames, dtype="float32")
+            buffer_start = 0
+            start_frame = 0
+
+            while start_frame < total_frames:
+                end_frame = min(start_frame + chunk_frames, total_frames)
+
+                # Refill the window, keeping only the not-yet-consumed tail
+                if end_frame > buffer_start + len(buffer):
+                    tail = buffer[start_frame - buffer_start :]
+                    buffer = np.concatenate(
+                        (tail, f.read(read_frames, dtype="float32"))
+                    )
+                    buffer_start = start_frame
+
+                offset = start_frame - buffer_start
+                audio_chunk = buffer[offset : offset + end_frame - start_frame]
+
+                # Frame counts of compressed formats can be approximate
+                if len(audio_chunk) == 0:
+                    break
+                end_frame = start_frame + len(audio_chunk)
+
+                yield (
+                    audio_chunk,
+                    sample_rate,
+                    start_frame / sample_rate,
+                    end_frame / sample_rate,
+                )
+
+                # Break if we've reached the end
+                if end_frame >= total_frames:
+                    break
+
+                # Move to next chunk
+                start_frame += step_frames
@@ -50,6 +50,40 @@ class Config(BaseSettings):
     asr_prompt: str = Field(
         default="Perform ASR.", description="System prompt for ASR task"
     )
+    asr_server_enabled: bool = Field(
+        default=True,
+        description="Keep the model resident in a persistent llama.cpp audio server",
+    )
+    asr_server_port: int = Field(
+        default=8142, description="Preferred port for the persistent ASR server"
+    )
+    asr_server_parallel: int = Field(
+        default=1, description="Number of parallel decoding slots in the ASR server"
+    )
+
+    # Transcription cache settings
+    cache_enabled: bool = Field(
+        default=True, description="Reuse transcriptions of previously seen audio"
+    )
+    cache_path: Path = Field(
+        # Resolved when the config is created, shared by every working directory
+        default_factory=lambda: (
+            Path.home() / ".cache" / "audio-transcription-cli" / "transcriptions.sqlite"
+        ),
+        description="SQLite database file for the transcription cache",
+    )
+    cache_max_entries: int = Field(
+        default=100_000,
+        description="Number of cached transcriptions kept before LRU eviction",
+    )
+
+    # Voice activity detection settings
+    vad_max_segment_duration: float = Field(
+        default=5.0, description="Maximum duration in seconds of a VAD speech segment"
+    )
+    vad_min_silence_duration: float = Field(
+        default=0.3, description="Pause length in seconds that ends a VAD segment"
+    )
 
     # Text cleaner model settings
     text_cleaner_model_filename: str = Field(
@@ -75,6 +109,31 @@ class Config(BaseSettings):
         description="User prompt template for the text cleaner model (use {raw_text} placeholder)",
     )
 
+    text_cleaner_incremental_user_prompt: str = Field(
+        default=(
+            "Previous cleaned transcript, for context only:\n\n"
+            "{context}\n\n"
+            "Clean the following continuation of the raw transcript. "
+            "Output only the cleaned continuation:\n\n"
+            "{raw_text}"
+        ),
+        description=(
+            "User prompt template for incremental cleaning "
+            "(use {context} and {raw_text} placeholders)"
+        ),
+    )
+    text_cleaning_context_words: int = Field(
+        default=50,
+        description=(
+            "Number of previously cleaned words given as context when cleaning "
+            "incrementally"
+        ),
+    )
+    text_cleaning_max_batch: int = Field(
+        default=4,
+        description="Maximum number of pending chunks cleaned in one completion",
+    )
+
     # Typewriter effect settings
     typewriter_enabled: bool = Field(
         default=False,
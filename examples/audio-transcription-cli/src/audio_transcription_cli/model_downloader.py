@@ -17,6 +17,8 @@ class ModelDownloader:
 
     REPO_URL = "https://huggingface.co/LiquidAI/LFM2-Audio-1.5B-GGUF"
     SUPPORTED_PLATFORMS = ["android-arm64", "macos-arm64", "ubuntu-arm64", "ubuntu-x64"]
+    # Context tokens per server slot, enough for a chunk and its transcription
+    CONTEXT_PER_SLOT = 4096
 
     def __init__(self, target_dir: str, quantization: str = "Q8_0"):
         self.target_dir = target_dir
@@ -32,6 +34,7 @@ class ModelDownloader:
         )
         self.audiodecoder_filename = f"audiodecoder-LFM2-Audio-1.5B-{quantization}.gguf"
         self.llama_binary_name = "llama-lfm2-audio"
+        self.llama_server_binary_name = "llama-liquid-audio-server"
         self.asr_prompt = "Perform ASR."
 
         self._warm_up_llama_cpp()
@@ -41,6 +44,11 @@ class ModelDownloader:
         """Return the path to the llama-lfm2-audio binary for the current platform."""
         return Path(self.target_dir) / "runners" / self.platform / f"lfm2-audio-{self.platform}"
 
+    @property
+    def has_server_binary(self) -> bool:
+        """Return True if the persistent audio server binary is available."""
+        return (self.llama_cpp_binary_dir / self.llama_server_binary_name).exists()
+
     @property
     def model_path(self) -> Path:
         """Return the path to the main model file."""
@@ -123,7 +131,39 @@ class ModelDownloader:
             "--audio",
             audio_file_path,
         ]
-    
+
+    def get_server_command(
+        self, host: str, port: int, parallel: int = 1
+    ) -> list[str]:
+        """
+        Get command line arguments for the persistent llama-liquid-audio-server.
+
+        Args:
+            host: Host interface the server binds to
+            port: Port the server listens on
+            parallel: Number of requests the server decodes concurrently
+
+        Returns:
+            List of command arguments
+        """
+        cmd = [
+            str(self.llama_cpp_binary_dir / self.llama_server_binary_name),
+            "-m",
+            str(self.model_path),
+            "-mm",
+            str(self.mmproj_path),
+            "-mv",
+            str(self.audiodecoder_path),
+            "--host",
+            host,
+            "--port",
+            str(port),
+        ]
+        if parallel > 1:
+            # The context is split between slots, grow it so each keeps a full one
+            cmd += ["-np", str(parallel), "-c", str(self.CONTEXT_PER_SLOT * parallel)]
+        return cmd
+
     def _validate_existing_download(self) -> bool:
         """Check if the target directory contains a valid download."""
         target_path = Path(self.target_dir)
@@ -1,13 +1,226 @@
 """Model wrapper for llama-lfm2-audio binary integration."""
 
 import os
+import queue
+import re
+import shutil
 import subprocess
+import sys
+import threading
 import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
-from .audio_preprocessing import AudioChunker
+from .asr_server import ASRServer
+from .audio_preprocessing import AudioChunker, encode_wav_bytes
 from .config import Config
 from .model_downloader import ModelDownloader
+from .transcript_stitcher import TranscriptStitcher, overlap_window
+from .transcription_cache import TranscriptionCache, audio_cache_key, file_cache_key
+from .voice_activity import VADChunker
+
+# llama.cpp log lines start with a function-style prefix ("load_gguf:",
+# "llama_model_loader:", "main:") or are audio encoding progress messages
+_LOG_LINE_PATTERN = re.compile(
+    r"^(?:[a-z][a-z0-9]*(?:_[a-z0-9]+)+:|main:|"
+    r"encoding audio slice|audio slice encoded|audio decoded)"
+)
+
+
+class LiveTranscriptDisplay:
+    """
+    Console display that shows raw text at once and swaps in cleaned text later.
+
+    Raw words are printed dimmed as soon as ASR produces them. When the cleaner
+    returns, the dimmed region is redrawn with the cleaned text followed by the
+    raw text that is still pending. Only the pending region is redrawn, so the
+    cost does not grow with the transcript length. On a non-interactive stdout,
+    only cleaned text is printed.
+    """
+
+    DIM = "\033[2m"
+    RESET = "\033[0m"
+
+    def __init__(self, start_column: int = 0):
+        """
+        Initialize the display.
+
+        Args:
+            start_column: Console column the transcript starts at
+        """
+        self._lock = threading.Lock()
+        self._interactive = sys.stdout.isatty()
+        self._width = shutil.get_terminal_size().columns
+        self._raw_groups: list[list[str]] = [[]]
+
+        # Position of the pending region relative to the cursor
+        self._region_column = start_column
+        self._cursor_rows_below_region = 0
+
+    def show_raw(self, word: str) -> None:
+        """Show a raw word at the end of the pending region."""
+        with self._lock:
+            self._raw_groups[-1].append(word)
+            self._redraw("")
+
+    def end_raw_group(self) -> None:
+        """Mark the end of the raw text that was submitted for cleaning together."""
+        with self._lock:
+            self._raw_groups.append([])
+
+    def replace_raw(self, num_groups: int, cleaned: str) -> None:
+        """
+        Replace the oldest pending raw groups with their cleaned text.
+
+        Args:
+            num_groups: Number of raw groups covered by `cleaned`
+            cleaned: Cleaned text for those groups
+        """
+        with self._lock:
+            del self._raw_groups[:num_groups]
+            if not self._raw_groups:
+                self._raw_groups.append([])
+
+            committed = " " + cleaned if cleaned else ""
+            self._redraw(committed)
+
+            # The cleaned text is final: move the region start past it
+            end = self._region_column + len(committed)
+            self._region_column = end % self._width
+            self._cursor_rows_below_region -= end // self._width
+
+    def _redraw(self, committed: str) -> None:
+        """Redraw the pending region, prefixed with newly committed text."""
+        if not self._interactive:
+            print(committed, end="", flush=True)
+            return
+
+        raw = " ".join(" ".join(group) for group in self._raw_groups if group)
+        raw = " " + raw if raw else ""
+
+        # Move back to the start of the pending region and clear below it
+        if self._cursor_rows_below_region > 0:
+            print(f"\033[{self._cursor_rows_below_region}A", end="")
+        print("\r", end="")
+        if self._region_column > 0:
+            print(f"\033[{self._region_column}C", end="")
+        print("\033[J", end="")
+
+        print(f"{committed}{self.DIM}{raw}{self.RESET}", end="", flush=True)
+        end = self._region_column + len(committed) + len(raw)
+        self._cursor_rows_below_region = end // self._width
+
+
+class CleanerStage:
+    """
+    Runs the text cleaner on its own thread, fed by a bounded queue.
+
+    ASR pushes new raw text with `submit` and carries on; the worker cleans it
+    and reports the result through `on_cleaned`. When several items are waiting,
+    they are cleaned together in one completion. A full queue blocks the
+    producer, and the time spent blocked is reported as backpressure.
+    """
+
+    def __init__(
+        self,
+        text_cleaner,
+        on_cleaned: Callable[[int, str], None],
+        context_words: int = 50,
+        max_batch: int = 4,
+        max_queue_size: int = 8,
+    ):
+        """
+        Initialize the cleaner stage.
+
+        Args:
+            text_cleaner: TextCleaner with a loaded model
+            on_cleaned: Called with (number_of_items, cleaned_text) per batch
+            context_words: Number of previously cleaned words given as context
+            max_batch: Maximum number of items cleaned in one completion
+            max_queue_size: Maximum number of items waiting to be cleaned
+        """
+        self.text_cleaner = text_cleaner
+        self.on_cleaned = on_cleaned
+        self.context_words = context_words
+        self.max_batch = max_batch
+
+        self.cleaned_parts: list[str] = []
+        self._queue: queue.Queue[str | None] = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+
+        # Backpressure metrics
+        self.items_submitted = 0
+        self.batches_cleaned = 0
+        self.max_queue_depth = 0
+        self.producer_blocked_time = 0.0
+        self.cleaning_time = 0.0
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        self._thread.start()
+
+    def submit(self, raw_text: str) -> None:
+        """Queue raw text for cleaning, blocking only if the queue is full."""
+        wait_start = time.time()
+        self._queue.put(raw_text)
+        self.producer_blocked_time += time.time() - wait_start
+        self.items_submitted += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+    def close(self) -> None:
+        """Wait until everything submitted has been cleaned, then stop."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def metrics_summary(self) -> str:
+        """Return a one-line summary of the backpressure metrics."""
+        average = self.cleaning_time / max(self.batches_cleaned, 1)
+        return (
+            f"{self.items_submitted} chunks in {self.batches_cleaned} batches | "
+            f"avg clean {average:.2f}s | max queue depth {self.max_queue_depth} | "
+            f"ASR blocked {self.producer_blocked_time:.2f}s"
+        )
+
+    def _worker(self) -> None:
+        """Clean queued text in batches until the stop sentinel is received."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            # Take whatever else is already waiting, up to the batch size
+            batch = [item]
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            context_words = " ".join(self.cleaned_parts).split()
+            context = " ".join(context_words[-self.context_words :])
+
+            clean_start = time.time()
+            try:
+                cleaned = self.text_cleaner.clean_incremental(batch, context=context)
+            except Exception as e:
+                # Keep the worker alive, or the producer blocks on a full queue
+                print(f"⚠️ Text cleaning failed: {e}")
+                print("📝 Falling back to raw transcription")
+                cleaned = " ".join(batch)
+            self.cleaning_time += time.time() - clean_start
+            self.batches_cleaned += 1
+
+            if cleaned:
+                self.cleaned_parts.append(cleaned)
+            self.on_cleaned(len(batch), cleaned)
+
 
 class LFM2AudioWrapper:
     """Wrapper for llama-lfm2-audio binary."""
@@ -21,11 +234,58 @@ class LFM2AudioWrapper:
         """
         self.model_downloader = model_downloader
         self.config = config
+        self._server: ASRServer | None = None
+        self._cache: TranscriptionCache | None = None
+        if self.config.cache_enabled:
+            self._cache = TranscriptionCache(
+                self.config.cache_path, max_entries=self.config.cache_max_entries
+            )
 
         # # Validate configuration
         # if not self.model_downloader.validate_paths():
         #     raise ValueError("Invalid configuration: missing required files")
 
+    def start_server(self) -> bool:
+        """
+        Start the persistent ASR server so the model stays loaded between chunks.
+
+        Falls back to one `llama-lfm2-audio` process per chunk if the server
+        binary is not available or fails to start.
+
+        Returns:
+            True if the server is running, False otherwise
+        """
+        if self._server is not None and self._server.is_running():
+            return True
+
+        if not self.config.asr_server_enabled:
+            return False
+
+        if not self.model_downloader.has_server_binary:
+            print("⚠️ ASR server binary not found, running one process per chunk")
+            return False
+
+        server = ASRServer(
+            self.model_downloader,
+            port=self.config.asr_server_port,
+            parallel=self.config.asr_server_parallel,
+        )
+        try:
+            server.start()
+        except Exception as e:
+            print(f"⚠️ ASR server failed to start: {e}")
+            print("📝 Falling back to one process per chunk")
+            return False
+
+        self._server = server
+        return True
+
+    def stop_server(self) -> None:
+        """Stop the persistent ASR server if it is running."""
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
+
     def transcribe_audio_file(self, audio_file_path: str | Path) -> str:
         """
         Transcribe audio file to text using LFM2 model.
@@ -45,98 +305,125 @@ class LFM2AudioWrapper:
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-        # Get command arguments
-        # cmd = self.config.get_model_command(audio_path)
-        cmd = self.model_downloader.get_model_command(audio_path)
-
-        try:
-            # Run the model from current working directory (not base_dir)
-            # since paths in cmd are already absolute
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=False,  # Get bytes to handle encoding issues properly
-                timeout=30,  # 30 second timeout
-                check=False,  # Don't raise exception on non-zero return code
+        cache_key = None
+        if self._cache is not None:
+            cache_key = file_cache_key(
+                audio_path, self.model_downloader.quantization, self.config.asr_prompt
             )
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-            if result.returncode != 0:
-                error_msg = f"Model execution failed with code {result.returncode}"
-                if result.stderr:
-                    error_msg += f": {result.stderr}"
-                raise RuntimeError(error_msg)
+        transcription = self._run_model_on_file(audio_path)
 
-            # Extract transcription from stdout
-            transcription = self._parse_output(result.stdout)
-            return transcription
-
-        except subprocess.TimeoutExpired:
-            raise RuntimeError("Model execution timed out")
-        except Exception as e:
-            raise RuntimeError(f"Model execution failed: {str(e)}")
+        if cache_key is not None:
+            self._cache.put(cache_key, transcription)
+        return transcription
 
-    def _parse_output(self, output: bytes) -> str:
+    def _run_model_on_file(self, audio_path: str) -> str:
         """
-        Parse model output to extract transcription.
+        Transcribe an audio file with the ASR server, or the binary as fallback.
 
         Args:
-            output: Raw stdout from model as bytes
+            audio_path: Path to audio file
 
         Returns:
-            Cleaned transcription text
+            Transcribed text
+
+        Raises:
+            RuntimeError: If transcription fails
+        """
+        pieces = self._stream_model_on_file(audio_path)
+        return self._clean_transcription("".join(pieces))
+
+    def _stream_model_on_file(self, audio_path: str) -> Iterator[str]:
+        """
+        Transcribe an audio file, yielding raw text as the model decodes it.
+
+        Args:
+            audio_path: Path to audio file
+
+        Yields:
+            Pieces of the raw transcription, in order
+
+        Raises:
+            RuntimeError: If transcription fails
         """
-        # Decode bytes to string
+        # Send the audio to the resident model if the server is up
+        if self._server is not None and self._server.is_running():
+            with open(audio_path, "rb") as f:
+                wav_bytes = f.read()
+            yield from self._server.transcribe_stream(wav_bytes, self.config.asr_prompt)
+            return
+
+        # Get command arguments
+        # cmd = self.config.get_model_command(audio_path)
+        cmd = self.model_downloader.get_model_command(audio_path)
+
+        # Run the model from current working directory (not base_dir)
+        # since paths in cmd are already absolute
         try:
-            output_str = output.decode("utf-8", errors="replace")
-        except Exception:
-            output_str = str(output)
-
-        # The model output may contain various information
-        # We need to extract just the transcription
-        lines = output_str.strip().split("\n")
-
-        # Look for the actual transcription in the output
-        # This may need adjustment based on actual model output format
-        transcription_lines = []
-        capturing = False
-
-        for line in lines:
-            line = line.strip()
-
-            # Skip empty lines
-            if not line:
-                continue
-
-            # Skip model loading messages
-            if any(
-                keyword in line.lower()
-                for keyword in [
-                    "loading",
-                    "model",
-                    "load_gguf",
-                    "loaded",
-                    "tensors",
-                    "gguf",
-                    "encoding",
-                    "slice",
-                ]
-            ):
-                continue
+            process = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+        except OSError as e:
+            raise RuntimeError(f"Model execution failed: {str(e)}")
 
-            # Skip timing/performance info
-            if "ms" in line or "tokens" in line or "speed" in line:
-                continue
+        # Drain stderr in the background so a chatty binary cannot block on it
+        stderr_chunks: list[bytes] = []
+        stderr_thread = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True
+        )
+        stderr_thread.start()
 
-            # This should be the transcription
-            transcription_lines.append(line)
+        # Kill the process if it runs past the 30 second timeout
+        timer = threading.Timer(30, process.kill)
+        timer.start()
+        try:
+            # Read stdout line by line as the binary writes it. Log lines are mixed
+            # in and only recognizable once complete, so this path yields lines
+            for raw_line in process.stdout:
+                line = self._parse_output_line(raw_line)
+                if line:
+                    yield line + "\n"
+
+            process.wait()
+        finally:
+            timed_out = not timer.is_alive()
+            timer.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            stderr_thread.join(timeout=1.0)
+            process.stdout.close()
+            process.stderr.close()
+
+        if timed_out:
+            raise RuntimeError("Model execution timed out")
 
-        # Join all transcription lines
-        transcription = " ".join(transcription_lines).strip()
+        if process.returncode != 0:
+            error_msg = f"Model execution failed with code {process.returncode}"
+            if stderr_chunks and stderr_chunks[0]:
+                error_msg += f": {stderr_chunks[0]}"
+            raise RuntimeError(error_msg)
 
-        # Clean up the transcription
-        transcription = self._clean_transcription(transcription)
+    def _parse_output_line(self, raw_line: bytes) -> str | None:
+        """
+        Parse one line of model stdout.
 
-        return transcription
+        Only lines matching llama.cpp's log format are dropped, so transcript
+        text that happens to contain words like "model" or "ms" is kept.
+
+        Args:
+            raw_line: Raw stdout line from model as bytes
+
+        Returns:
+            Transcription text, or None for empty and log lines
+        """
+        line = raw_line.decode("utf-8", errors="replace").strip()
+        if not line or _LOG_LINE_PATTERN.match(line):
+            return None
+        return line
 
     def _clean_transcription(self, text: str) -> str:
         """
@@ -183,22 +470,68 @@ class LFM2AudioWrapper:
         Returns:
             Transcribed text
         """
-        # Import here to avoid circular imports
-        from .audio_preprocessing import save_raw_audio_as_wav
+        pieces = self.transcribe_audio_data_stream(audio_data, sample_rate)
+        return self._clean_transcription("".join(pieces))
 
-        # Save audio data to temporary file
-        temp_file = save_raw_audio_as_wav(audio_data, sample_rate)
+    def transcribe_audio_data_stream(
+        self, audio_data, sample_rate: int = 48000
+    ) -> Iterator[str]:
+        """
+        Transcribe audio data (numpy array), yielding text as it is decoded.
+
+        When the persistent ASR server is running the audio is sent as an
+        in-memory WAV buffer; otherwise it is staged in a temporary file for
+        the `llama-lfm2-audio` binary.
+
+        Args:
+            audio_data: Audio data as numpy array
+            sample_rate: Sample rate of audio data
+
+        Yields:
+            Pieces of the raw transcription, in order
+        """
+        cache_key = None
+        if self._cache is not None:
+            cache_key = audio_cache_key(
+                audio_data,
+                sample_rate,
+                self.model_downloader.quantization,
+                self.config.asr_prompt,
+            )
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        pieces = []
+        if self._server is not None and self._server.is_running():
+            wav_bytes = encode_wav_bytes(audio_data, sample_rate)
+            for piece in self._server.transcribe_stream(
+                wav_bytes, self.config.asr_prompt
+            ):
+                pieces.append(piece)
+                yield piece
+        else:
+            # Import here to avoid circular imports
+            from .audio_preprocessing import save_raw_audio_as_wav
+
+            # Save audio data to temporary file
+            temp_file = save_raw_audio_as_wav(audio_data, sample_rate)
 
-        try:
-            # Transcribe the temporary file
-            transcription = self.transcribe_audio_file(temp_file)
-            return transcription
-        finally:
-            # Clean up temporary file
             try:
-                os.unlink(temp_file)
-            except OSError:
-                pass  # File might already be deleted
+                # Transcribe the temporary file
+                for piece in self._stream_model_on_file(temp_file):
+                    pieces.append(piece)
+                    yield piece
+            finally:
+                # Clean up temporary file
+                try:
+                    os.unlink(temp_file)
+                except OSError:
+                    pass  # File might already be deleted
+
+        if cache_key is not None:
+            self._cache.put(cache_key, self._clean_transcription("".join(pieces)))
 
     def test_model(self) -> bool:
         """
@@ -241,6 +574,7 @@ class LFM2AudioWrapper:
         clean_text: bool = False,
         log_partial_transcripts: str | None = None,
         typewriter_effect: bool = False,
+        vad: bool = False,
     ) -> str:
         """
         Transcribe audio file with real-time processing that respects actual speech timing.
@@ -253,6 +587,8 @@ class LFM2AudioWrapper:
             clean_text: Whether to clean transcription with language model
             log_partial_transcripts: CSV file path to log incremental transcriptions
             typewriter_effect: Whether to display text with typewriter effect
+            vad: Whether to split audio at pauses and skip silence instead of
+                using fixed-size chunks
 
         Returns:
             Complete transcription (cleaned if clean_text=True)
@@ -264,21 +600,27 @@ class LFM2AudioWrapper:
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
         # Initialize chunker
-        chunker = AudioChunker(chunk_duration=chunk_duration, overlap=overlap)
+        chunker = self._create_chunker(chunk_duration, overlap, vad)
 
         # Get audio info
         total_duration, _, _ = chunker.get_audio_info(audio_path)
 
         print(f"🎵 Starting real-time transcription of {audio_path}")
-        print(f"📊 Duration: {total_duration:.1f}s | Chunk size: {chunk_duration}s")
+        if vad:
+            print(
+                f"📊 Duration: {total_duration:.1f}s | "
+                f"Max segment size: {chunker.max_segment_duration}s"
+            )
+        else:
+            print(f"📊 Duration: {total_duration:.1f}s | Chunk size: {chunk_duration}s")
         print("📝 Real-time transcription:")
         print("-" * 60)
         print("📝 ", end="", flush=True)  # Start the line
 
         raw_transcription_parts = []  # Store raw chunks for context
         already_displayed_parts = []  # Track what's shown on console
-        chunk_files_to_cleanup = []
-        cleaning_line_count = 0  # Track console lines used for cleaning output
+        # Drop words repeated in chunk overlaps
+        stitcher = TranscriptStitcher(window=0 if vad else overlap_window(overlap))
 
         # Initialize text cleaner BEFORE audio to minimize delay
         text_cleaner = None
@@ -311,6 +653,19 @@ class LFM2AudioWrapper:
                 print(f"⚠️ Raw transcript logger initialization failed: {e}")
                 raw_transcript_logger = None
 
+        # Run the cleaner on its own thread so it never delays ASR
+        cleaner_stage = None
+        live_display = None
+        if text_cleaner:
+            live_display = LiveTranscriptDisplay()
+            cleaner_stage = CleanerStage(
+                text_cleaner,
+                on_cleaned=live_display.replace_raw,
+                context_words=self.config.text_cleaning_context_words,
+                max_batch=self.config.text_cleaning_max_batch,
+            )
+            cleaner_stage.start()
+
         # Initialize audio player AFTER models are ready
         audio_player = None
         if play_audio:
@@ -325,9 +680,9 @@ class LFM2AudioWrapper:
         start_time = time.time()
 
         # Process all chunks in unified loop
-        for chunk_path, chunk_start, chunk_end in chunker.create_chunks(audio_path):
-            chunk_files_to_cleanup.append(chunk_path)
-
+        for audio_chunk, sample_rate, chunk_start, chunk_end in (
+            chunker.iter_audio_chunks(audio_path)
+        ):
             # Calculate when this chunk should be processed (real-time simulation)
             expected_time = start_time + chunk_start
             current_time = time.time()
@@ -339,60 +694,56 @@ class LFM2AudioWrapper:
 
             # Process chunk
             # breakpoint()
-            chunk_transcription = self.transcribe_audio_file(chunk_path)
+            raw_pieces: list[str] = []
+            chunk_stream = self._collect_pieces(
+                self.transcribe_audio_data_stream(audio_chunk, sample_rate), raw_pieces
+            )
+
+            new_content = ""
+            if cleaner_stage:
+                # Show raw words at once, the cleaner thread swaps them out later
+                new_words = []
+                for word in stitcher.add_stream(chunk_stream):
+                    live_display.show_raw(word)
+                    new_words.append(word)
+                if new_words:
+                    live_display.end_raw_group()
+                    cleaner_stage.submit(" ".join(new_words))
+
+                chunk_transcription = self._clean_transcription("".join(raw_pieces))
+                if chunk_transcription.strip():
+                    # Accumulate raw transcription for context
+                    raw_transcription_parts.append(chunk_transcription)
+            else:
+                # No text cleaner - display words as they are decoded, minus the
+                # overlap region
+                new_words = []
+                for word in stitcher.add_stream(chunk_stream):
+                    self._display_text(" " + word, typewriter_effect)
+                    new_words.append(word)
+                new_content = " ".join(new_words)
+
+                chunk_transcription = self._clean_transcription("".join(raw_pieces))
+                if chunk_transcription.strip():
+                    # Accumulate raw transcription for context
+                    raw_transcription_parts.append(chunk_transcription)
+
+            if new_content:
+                already_displayed_parts.append(new_content)
 
             # Log incremental transcription if logger is available
             if raw_transcript_logger and chunk_transcription.strip():
                 raw_transcript_logger.log_incremental_chunk(chunk_transcription)
 
-            if chunk_transcription.strip():
-                # Accumulate raw transcription for context
-                raw_transcription_parts.append(chunk_transcription)
-
-                # Clean with context of last 2 chunks + current if text cleaner available
-                new_content = ""
-                if text_cleaner:
-                    raise Exception("Not implemented yet")
-
-                    # Use context window: last 2 chunks + current chunk
-                    if len(raw_transcription_parts) >= 3:
-                        context_chunks = raw_transcription_parts[-3:]
-                    else:
-                        context_chunks = raw_transcription_parts
-
-                    context_text = " ".join(context_chunks)
-                    cleaned_context = text_cleaner.clean_text(context_text)
-
-                    # Extract only new content
-                    new_content = self._extract_new_content(
-                        cleaned_context, already_displayed_parts, chunk_transcription
-                    )
-                else:
-                    # No text cleaner - use raw chunk
-                    new_content = chunk_transcription
-
-                # Append new content to console if we have any
-                if new_content:
-                    if typewriter_effect:
-                        # Use typewriter effect for displaying new content
-                        self._typewriter_display(
-                            " " + new_content,
-                            speed=self.config.typewriter_speed,
-                            respect_words=self.config.typewriter_respect_words,
-                        )
-                    else:
-                        # Standard immediate display
-                        print(" " + new_content, end="", flush=True)
-                    already_displayed_parts.append(new_content)
+        # Wait for the cleaner to catch up once the audio is over
+        if cleaner_stage:
+            cleaner_stage.close()
+            already_displayed_parts = cleaner_stage.cleaned_parts
 
         # Stop audio playback
         if audio_player:
             audio_player.stop_playback()
 
-        # Clean up chunk files
-        for chunk_file in chunk_files_to_cleanup:
-            os.unlink(chunk_file)
-
         # Get final transcription from displayed parts or raw parts as fallback
         full_transcription = (
             " ".join(already_displayed_parts)
@@ -402,9 +753,154 @@ class LFM2AudioWrapper:
         print(f"\n{'-' * 60}")
         print(f"✅ Complete transcription ({time.time() - start_time:.1f}s):")
         print(f"📄 {full_transcription}")
+        if cleaner_stage:
+            print(f"🧹 Cleaner: {cleaner_stage.metrics_summary()}")
 
         return full_transcription
 
+    def transcribe_offline(
+        self,
+        audio_file_path: str | Path,
+        chunk_duration: float = 2.0,
+        overlap: float = 0.5,
+        max_workers: int = 4,
+        vad: bool = False,
+    ) -> str:
+        """
+        Transcribe audio file as fast as possible, without real-time pacing.
+
+        Chunks are transcribed concurrently by a pool of worker threads (each
+        one waiting on the ASR server or on its own `llama-lfm2-audio` process)
+        and the text is reassembled in chunk order. At most `2 * max_workers`
+        chunks are in flight, so memory use does not grow with file length.
+
+        Args:
+            audio_file_path: Path to audio file
+            chunk_duration: Duration of each chunk in seconds
+            overlap: Overlap between chunks in seconds
+            max_workers: Number of chunks transcribed concurrently
+            vad: Whether to split audio at pauses and skip silence instead of
+                using fixed-size chunks
+
+        Returns:
+            Complete transcription
+        """
+        audio_path = str(audio_file_path)
+
+        # Verify input file exists
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        chunker = self._create_chunker(chunk_duration, overlap, vad)
+        total_duration, _, _ = chunker.get_audio_info(audio_path)
+
+        print(f"🎵 Starting offline transcription of {audio_path}")
+        print(f"📊 Duration: {total_duration:.1f}s | Workers: {max_workers}")
+        print("-" * 60)
+
+        start_time = time.time()
+        transcription_parts = []
+
+        # Futures are collected in submission order, which is chunk order
+        pending: deque[Future[str]] = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for audio_chunk, sample_rate, _, _ in chunker.iter_audio_chunks(
+                audio_path
+            ):
+                pending.append(
+                    executor.submit(self.transcribe_audio_data, audio_chunk, sample_rate)
+                )
+                while len(pending) >= 2 * max_workers:
+                    transcription_parts.append(pending.popleft().result())
+
+            while pending:
+                transcription_parts.append(pending.popleft().result())
+
+        stitcher = TranscriptStitcher(window=0 if vad else overlap_window(overlap))
+        for part in transcription_parts:
+            stitcher.add(part)
+        full_transcription = stitcher.text
+
+        elapsed_time = time.time() - start_time
+        print(
+            f"✅ Complete transcription ({elapsed_time:.1f}s, "
+            f"{total_duration / max(elapsed_time, 1e-6):.1f}x real time):"
+        )
+        print(f"📄 {full_transcription}")
+
+        return full_transcription
+
+    def transcribe_file(
+        self,
+        audio_file_path: str | Path,
+        chunk_duration: float = 2.0,
+        overlap: float = 0.5,
+        vad: bool = False,
+    ) -> str:
+        """
+        Transcribe audio file chunk by chunk, without pacing or console output.
+
+        Meant for callers that already parallelize across files, such as the
+        batch command.
+
+        Args:
+            audio_file_path: Path to audio file
+            chunk_duration: Duration of each chunk in seconds
+            overlap: Overlap between chunks in seconds
+            vad: Whether to split audio at pauses and skip silence instead of
+                using fixed-size chunks
+
+        Returns:
+            Complete transcription
+        """
+        audio_path = str(audio_file_path)
+
+        # Verify input file exists
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        chunker = self._create_chunker(chunk_duration, overlap, vad)
+        stitcher = TranscriptStitcher(window=0 if vad else overlap_window(overlap))
+        for audio_chunk, sample_rate, _, _ in chunker.iter_audio_chunks(audio_path):
+            stitcher.add(self.transcribe_audio_data(audio_chunk, sample_rate))
+
+        return stitcher.text
+
+    def _create_chunker(
+        self, chunk_duration: float, overlap: float, vad: bool
+    ) -> AudioChunker:
+        """Create a fixed-size chunker, or a pause-aligned one if `vad` is set."""
+        if vad:
+            return VADChunker(
+                max_segment_duration=self.config.vad_max_segment_duration,
+                min_silence_duration=self.config.vad_min_silence_duration,
+            )
+        return AudioChunker(chunk_duration=chunk_duration, overlap=overlap)
+
+    @staticmethod
+    def _collect_pieces(pieces: Iterator[str], sink: list[str]) -> Iterator[str]:
+        """Pass streamed pieces through while recording them in `sink`."""
+        for piece in pieces:
+            sink.append(piece)
+            yield piece
+
+    def _display_text(self, text: str, typewriter_effect: bool) -> None:
+        """Append text to the console, with the typewriter effect if enabled."""
+        if typewriter_effect:
+            # The typewriter splits on words, so print the separator first
+            if text[:1].isspace():
+                print(" ", end="", flush=True)
+
+            # Use typewriter effect for displaying new content
+            self._typewriter_display(
+                text.strip(),
+                speed=self.config.typewriter_speed,
+                respect_words=self.config.typewriter_respect_words,
+            )
+        else:
+            # Standard immediate display
+            print(text, end="", flush=True)
+
     def _typewriter_display(
         self, text: str, speed: float = 0.05, respect_words: bool = True
     ) -> None:
@@ -436,22 +932,14 @@ class LFM2AudioWrapper:
             if respect_words and i < len(words) - 1:
                 time.sleep(speed * 1.5)
 
-    def _clear_console_lines(self, line_count: int) -> None:
-        """Clear previous console output lines."""
-        for _ in range(line_count):
-            print("\033[A\033[K", end="")  # Move up one line and clear it
-
-    def _extract_new_content(
-        self, cleaned_text: str, displayed_parts: list, raw_chunk: str = ""
-    ) -> str:
-        """Extract only new content from cleaned text."""
-        if not displayed_parts:
-            return cleaned_text
-
-        existing_text = " ".join(displayed_parts)
-        if cleaned_text.startswith(existing_text.strip()):
-            new_content = cleaned_text[len(existing_text) :].strip()
-            return new_content
-        else:
-            # Fallback: use raw chunk if cleaning changed too much
-            return raw_chunk
+    def __enter__(self):
+        """Context manager entry."""
+        self.start_server()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit with cleanup."""
+        self.stop_server()
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
@@ -1,7 +1,5 @@
 """Text cleaning module for post-processing transcriptions."""
 
-import time
-
 from llama_cpp import Llama
 
 from .config import Config
@@ -40,10 +38,16 @@ class TextCleaner:
         try:
             print("🧹 Loading text cleaning model...")
             self._llama = Llama(
-                model_path=str(self.config.text_cleaner_model_path), verbose=False
+                model_path=str(self.config.text_cleaner_model_path),
+                n_ctx=self.config.text_cleaning_max_tokens,
+                verbose=False,
             )
 
             self._model_loaded = True
+
+            # Evaluate the system prompt once. llama.cpp keeps it in the KV cache
+            # and later calls only evaluate the tokens that differ from it.
+            self._complete(self._get_messages(""), max_tokens=1)
             print("✅ Text cleaning model loaded successfully")
             return True
 
@@ -72,40 +76,72 @@ class TextCleaner:
                 raise RuntimeError("Failed to load text cleaning model")
 
         try:
-            # Get messages for chat completion
-            messages = self._get_messages(raw_text)
-
-            # Generate cleaned text
-            start_time = time.time()
-
-            # Reset model state if available
-            if hasattr(self._llama, "reset"):
-                self._llama.reset()
-
-            response = self._llama.create_chat_completion(
-                messages=messages,
-                # TODO: extract these parameters to config
-                temperature=0.1,
-                min_p=0.15,
-                repeat_penalty=1.05,
-                max_tokens=512,
-            )
+            return self._complete(self._get_messages(raw_text))
+        except Exception as e:
+            print(f"⚠️ Text cleaning failed: {e}")
+            print("📝 Falling back to raw transcription")
+            return raw_text
 
-            # response = self._llama.create_chat_completion(messages=messages, temperature=0.1, min_p=0.15, repeat_penalty=1.05)
+    def clean_incremental(self, raw_chunks: list[str], context: str = "") -> str:
+        """
+        Clean newly transcribed chunks that continue an already cleaned transcript.
 
-            # Extract cleaned text from response
-            cleaned_text = self._extract_cleaned_text(response)
+        Only the new chunks are rewritten; `context` is passed so the model can
+        keep sentences coherent across chunks. Several pending chunks can be
+        cleaned in a single completion when the cleaner falls behind.
 
-            elapsed_time = time.time() - start_time
-            # print(f"🧹 Text cleaning completed in {elapsed_time:.1f}s")
+        Args:
+            raw_chunks: Raw transcriptions of the new chunks, in order
+            context: Tail of the cleaned transcript so far
 
-            return cleaned_text
+        Returns:
+            Cleaned text for the new chunks only
 
+        Raises:
+            RuntimeError: If model is not loaded
+        """
+        raw_text = " ".join(chunk for chunk in raw_chunks if chunk.strip())
+        if not raw_text:
+            return raw_text
+
+        if not self._model_loaded:
+            if not self.load_model():
+                raise RuntimeError("Failed to load text cleaning model")
+
+        try:
+            return self._complete(self._get_incremental_messages(raw_text, context))
         except Exception as e:
             print(f"⚠️ Text cleaning failed: {e}")
             print("📝 Falling back to raw transcription")
             return raw_text
 
+    def _complete(self, messages: list[dict[str, str]], max_tokens: int = 512) -> str:
+        """
+        Run a chat completion and extract the cleaned text.
+
+        The model is deliberately not reset between calls: llama-cpp-python
+        reuses the KV cache for the longest common token prefix, so the system
+        prompt is not re-evaluated on every call.
+
+        Args:
+            messages: Messages for chat completion
+            max_tokens: Maximum number of generated tokens
+
+        Returns:
+            Cleaned text
+        """
+        response = self._llama.create_chat_completion(
+            messages=messages,
+            # TODO: extract these parameters to config
+            temperature=0.1,
+            min_p=0.15,
+            repeat_penalty=1.05,
+            max_tokens=max_tokens,
+        )
+
+        # Extract cleaned text from response
+        return self._extract_cleaned_text(response)
+
     def _get_messages(self, raw_text: str) -> list[dict[str, str]]:
         """
         Get messages for chat completion API.
@@ -126,6 +162,34 @@ class TextCleaner:
             },
         ]
 
+    def _get_incremental_messages(
+        self, raw_text: str, context: str
+    ) -> list[dict[str, str]]:
+        """
+        Get messages for cleaning a continuation of the transcript.
+
+        The system prompt comes first and never changes, so it stays cached.
+
+        Args:
+            raw_text: Raw text to be cleaned
+            context: Tail of the cleaned transcript so far
+
+        Returns:
+            List of message dictionaries for chat completion
+        """
+        if not context:
+            return self._get_messages(raw_text)
+
+        return [
+            {"role": "system", "content": self.config.text_cleaner_system_prompt},
+            {
+                "role": "user",
+                "content": self.config.text_cleaner_incremental_user_prompt.format(
+                    context=context, raw_text=raw_text
+                ),
+            },
+        ]
+
     def _extract_cleaned_text(self, response: dict) -> str:
         """
         Extract cleaned text from chat completion response.
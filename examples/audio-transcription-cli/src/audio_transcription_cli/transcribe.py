@@ -18,6 +18,9 @@ def main(
     log_partial_transcripts: str = None,
     typewriter_effect: bool = False,
     typewriter_speed: float = None,
+    offline: bool = False,
+    workers: int = 4,
+    vad: bool = False,
 ):
     """Test real-time transcription functionality."""
     config = Config()
@@ -39,7 +42,9 @@ def main(
     if typewriter_speed is not None:
         config.typewriter_speed = typewriter_speed
 
-    model = LFM2AudioWrapper(model_downloader, config)
+    # Let the ASR server decode one request per worker in offline mode
+    if offline:
+        config.asr_server_parallel = workers
 
     # Validate audio file exists
     if not os.path.exists(audio_file):
@@ -47,27 +52,39 @@ def main(
         print("💡 Make sure the audio file exists at the specified path")
         return
 
-    try:
-        # Process with real-time timing and optional features
-        transcription = model.transcribe_with_real_timing(
-            audio_file_path=audio_file,
-            chunk_duration=2.0,  # 2 second chunks
-            overlap=0.5,  # 0.5 second overlap
-            play_audio=play_audio,
-            clean_text=clean_text,
-            log_partial_transcripts=log_partial_transcripts,
-            typewriter_effect=typewriter_effect,
-        )
-
-        print("\n🎯 Final Result:")
-        print(transcription)
-
-    except FileNotFoundError as e:
-        print(f"❌ Audio file not found: {e}")
-        print("💡 Make sure the audio file exists at the specified path")
-    except Exception as e:
-        print(f"❌ Error during transcription: {e}")
-        raise e
+    with LFM2AudioWrapper(model_downloader, config) as model:
+        try:
+            if offline:
+                # Process chunks concurrently, without real-time pacing
+                transcription = model.transcribe_offline(
+                    audio_file_path=audio_file,
+                    chunk_duration=2.0,  # 2 second chunks
+                    overlap=0.5,  # 0.5 second overlap
+                    max_workers=workers,
+                    vad=vad,
+                )
+            else:
+                # Process with real-time timing and optional features
+                transcription = model.transcribe_with_real_timing(
+                    audio_file_path=audio_file,
+                    chunk_duration=2.0,  # 2 second chunks
+                    overlap=0.5,  # 0.5 second overlap
+                    play_audio=play_audio,
+                    clean_text=clean_text,
+                    log_partial_transcripts=log_partial_transcripts,
+                    typewriter_effect=typewriter_effect,
+                    vad=vad,
+                )
+
+            print("\n🎯 Final Result:")
+            print(transcription)
+
+        except FileNotFoundError as e:
+            print(f"❌ Audio file not found: {e}")
+            print("💡 Make sure the audio file exists at the specified path")
+        except Exception as e:
+            print(f"❌ Error during transcription: {e}")
+            raise e
 
 
 def cli():
@@ -94,7 +111,10 @@ def cli():
         "--typewriter",
         action="store_true",
         default=True,
-        help="Enable typewriter effect for character-by-character display (default: enabled)",
+        help=(
+            "Enable typewriter effect for character-by-character display "
+            "(default: enabled)"
+        ),
     )
     parser.add_argument(
         "--typewriter-speed",
@@ -102,6 +122,25 @@ def cli():
         default=0.01,
         help="Speed of typewriter effect in seconds per character (default: 0.01)",
     )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help=(
+            "Transcribe as fast as possible with parallel workers, "
+            "without real-time pacing"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of chunks transcribed concurrently in offline mode (default: 4)",
+    )
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Split audio at pauses and skip silence instead of using fixed 2s chunks",
+    )
     args = parser.parse_args()
 
     main(
@@ -111,6 +150,9 @@ def cli():
         args.log_partial_transcripts,
         args.typewriter,
         args.typewriter_speed,
+        args.offline,
+        args.workers,
+        args.vad,
     )
 
 
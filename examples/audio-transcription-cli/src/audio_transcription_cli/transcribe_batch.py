@@ -0,0 +1,214 @@
+"""Batch transcription of many audio files with a resumable JSONL manifest."""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from .config import Config
+from .model_downloader import ModelDownloader
+from .model_wrapper import LFM2AudioWrapper
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".flac", ".ogg", ".m4a"}
+
+
+def find_audio_files(source: str) -> list[Path]:
+    """
+    Find audio files in a directory (recursively) or matching a glob pattern.
+
+    Args:
+        source: Directory path or glob pattern (e.g. 'calls/**/*.wav')
+
+    Returns:
+        Sorted list of audio file paths
+    """
+    if os.path.isdir(source):
+        candidates = Path(source).rglob("*")
+    else:
+        candidates = (Path(p) for p in glob.glob(source, recursive=True))
+
+    return sorted(
+        p for p in candidates if p.is_file() and p.suffix.lower() in AUDIO_EXTENSIONS
+    )
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class Manifest:
+    """Append-only JSONL manifest of transcribed files, keyed by content hash."""
+
+    def __init__(self, path: str | Path):
+        """
+        Load an existing manifest, if any.
+
+        Args:
+            path: Path to the JSONL manifest file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._hashes: set[str] = set()
+
+        if not self.path.exists():
+            return
+
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.readlines()
+        for line in lines:
+            try:
+                self._hashes.add(json.loads(line)["sha256"])
+            except (json.JSONDecodeError, KeyError):
+                # Partial line from an interrupted run
+                continue
+
+        # Terminate a partial last line so new records start on their own line
+        if lines and not lines[-1].endswith("\n"):
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n")
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def claim(self, sha256: str) -> bool:
+        """
+        Reserve a content hash for transcription.
+
+        Returns:
+            False if the content is already in the manifest or being transcribed
+        """
+        with self._lock:
+            if sha256 in self._hashes:
+                return False
+            self._hashes.add(sha256)
+            return True
+
+    def release(self, sha256: str) -> None:
+        """Give up a claimed hash (e.g. after a failure) so a rerun retries it."""
+        with self._lock:
+            self._hashes.discard(sha256)
+
+    def append(self, record: dict) -> None:
+        """Write a record and flush it, so it survives a crash."""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+
+
+def transcribe_one(
+    model: LFM2AudioWrapper, manifest: Manifest, path: Path, vad: bool
+) -> str:
+    """
+    Transcribe a single file unless its content is already in the manifest.
+
+    Returns:
+        "done", "skipped" or "failed"
+    """
+    sha256 = hash_file(path)
+    if not manifest.claim(sha256):
+        return "skipped"
+
+    start_time = time.time()
+    try:
+        transcription = model.transcribe_file(path, vad=vad)
+    except Exception as e:
+        manifest.release(sha256)
+        print(f"❌ {path}: {e}", file=sys.stderr)
+        return "failed"
+
+    manifest.append(
+        {
+            "sha256": sha256,
+            "path": str(path),
+            "transcription": transcription,
+            "elapsed": round(time.time() - start_time, 3),
+        }
+    )
+    return "done"
+
+
+def main(source: str, manifest_path: str, workers: int = 4, vad: bool = False):
+    """Transcribe every audio file in `source`, skipping ones already done."""
+    config = Config()
+
+    audio_files = find_audio_files(source)
+    if not audio_files:
+        print(f"❌ No audio files found in: {source}")
+        return
+
+    manifest = Manifest(manifest_path)
+    print(f"🗂️ Found {len(audio_files)} files, {len(manifest)} already in manifest")
+
+    # Download, validate and warm up the model once for the whole batch
+    try:
+        model_downloader = ModelDownloader(target_dir=config.base_dir)
+        model_downloader.download()
+    except Exception as e:
+        print(f"⚠️  Warning: Failed to auto-download llama.cpp builds: {e}")
+        sys.exit(1)
+
+    # Let the ASR server decode one request per worker
+    config.asr_server_parallel = workers
+
+    counts = {"done": 0, "skipped": 0, "failed": 0}
+    start_time = time.time()
+
+    with LFM2AudioWrapper(model_downloader, config) as model:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(transcribe_one, model, manifest, path, vad)
+                for path in audio_files
+            ]
+            for i, future in enumerate(as_completed(futures), start=1):
+                counts[future.result()] += 1
+                if i % 100 == 0 or i == len(futures):
+                    print(
+                        f"📊 {i}/{len(futures)} | done: {counts['done']} | "
+                        f"skipped: {counts['skipped']} | failed: {counts['failed']} | "
+                        f"{time.time() - start_time:.1f}s"
+                    )
+
+    print(f"✅ Manifest written to {manifest_path}")
+
+
+def cli():
+    """CLI entry point for the transcribe-batch command."""
+    parser = argparse.ArgumentParser(
+        description="Batch audio transcription with a resumable manifest"
+    )
+    parser.add_argument(
+        "source", help="Directory (searched recursively) or glob pattern of audio files"
+    )
+    parser.add_argument(
+        "--manifest",
+        default="transcriptions.jsonl",
+        help="JSONL file results are appended to; files already in it are skipped",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of files transcribed concurrently (default: 4)",
+    )
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Split audio at pauses and skip silence instead of using fixed 2s chunks",
+    )
+    args = parser.parse_args()
+
+    main(args.source, args.manifest, args.workers, args.vad)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,160 @@
+"""Overlap-aware stitching of transcriptions from overlapping audio chunks."""
+
+import math
+import re
+from collections.abc import Iterable, Iterator
+
+_NORMALIZE_PATTERN = re.compile(r"[^\w']+")
+
+# Fast speech rate, to bound the words an overlap can contain
+_MAX_WORDS_PER_SECOND = 4.0
+
+
+def _normalize(word: str) -> str:
+    """Normalize a word for comparison (case and punctuation insensitive)."""
+    return _NORMALIZE_PATTERN.sub("", word.lower())
+
+
+def iter_words(pieces: Iterable[str]) -> Iterator[str]:
+    """Regroup streamed text pieces into words, yielding each once complete."""
+    buffer = ""
+    for piece in pieces:
+        buffer += piece
+        words = buffer.split()
+        if words and not buffer[-1].isspace():
+            # The last word may continue in the next piece
+            buffer = words.pop()
+        else:
+            buffer = ""
+        yield from words
+
+    if buffer:
+        yield buffer
+
+
+def overlap_window(overlap: float) -> int:
+    """
+    Return the most words `overlap` seconds of speech can repeat.
+
+    Args:
+        overlap: Audio shared by consecutive chunks, in seconds
+
+    Returns:
+        Stitcher window, with a word cut at each edge of the overlap on top
+    """
+    if overlap <= 0:
+        return 0
+    return math.ceil(overlap * _MAX_WORDS_PER_SECOND) + 2
+
+
+class TranscriptStitcher:
+    """
+    Merge chunk transcriptions, dropping words repeated in the overlap region.
+
+    Consecutive chunks share `overlap` seconds of audio, so the head of each new
+    chunk usually repeats the tail of the transcript so far. Each new chunk is
+    aligned against the transcript by the longest run of words that ends the
+    transcript and starts within the first `window` words of the chunk. Only the
+    words after that run are appended. A run shorter than `min_match`, often a
+    single word in short overlaps, must start the chunk. Size `window` with
+    `overlap_window`, so only words the overlap can contain are compared. The
+    window is a constant, so stitching is linear in the transcript length.
+    """
+
+    def __init__(self, window: int = 12, min_match: int = 2):
+        """
+        Initialize transcript stitcher.
+
+        Args:
+            window: Number of words compared at each chunk boundary (0 disables
+                overlap removal, for chunks that do not overlap)
+            min_match: Minimum number of repeated words to drop when they do not
+                start the chunk
+        """
+        self.window = window
+        self.min_match = min_match
+        self.words: list[str] = []
+
+    @property
+    def text(self) -> str:
+        """Return the stitched transcript."""
+        return " ".join(self.words)
+
+    def add(self, chunk_text: str) -> str:
+        """
+        Add a chunk transcription to the transcript.
+
+        Args:
+            chunk_text: Transcription of the next chunk
+
+        Returns:
+            Words appended to the transcript (empty if the chunk was all overlap)
+        """
+        new_words = self._drop_overlap(chunk_text.split())
+        self.words.extend(new_words)
+        return " ".join(new_words)
+
+    def add_stream(self, pieces: Iterable[str]) -> Iterator[str]:
+        """
+        Add a chunk transcription that is still being decoded.
+
+        The first `window` words are held back until the overlap with the
+        transcript is resolved; every word after that is yielded as soon as it
+        is complete.
+
+        Args:
+            pieces: Text pieces of the next chunk, in decoding order
+
+        Yields:
+            Words appended to the transcript
+        """
+        head: list[str] = []
+        resolved = self.window <= 0 or not self.words
+
+        for word in iter_words(pieces):
+            if resolved:
+                self.words.append(word)
+                yield word
+                continue
+
+            head.append(word)
+            if len(head) >= self.window:
+                new_words = self._drop_overlap(head)
+                self.words.extend(new_words)
+                yield from new_words
+                resolved = True
+
+        if not resolved:
+            new_words = self._drop_overlap(head)
+            self.words.extend(new_words)
+            yield from new_words
+
+    def _drop_overlap(self, new_words: list[str]) -> list[str]:
+        """Remove the leading words of a chunk that repeat the transcript tail."""
+        if not new_words or self.window <= 0:
+            return new_words
+
+        tail = [_normalize(w) for w in self.words[-self.window :]]
+        head = [_normalize(w) for w in new_words[: self.window]]
+        return new_words[self._overlap_end(tail, head) :]
+
+    def _overlap_end(self, tail: list[str], head: list[str]) -> int:
+        """
+        Find where the repeat of the transcript tail ends in the chunk head.
+
+        The repeated words must end `tail` and start within `head`. The longest
+        repeat wins, and a repeat shorter than `min_match` only counts when it
+        starts `head`.
+
+        Returns:
+            Index in `head` of the first new word (0 if nothing is repeated)
+        """
+        for length in range(min(len(tail), len(head)), 0, -1):
+            repeat = tail[-length:]
+            if not all(repeat):
+                continue
+            starts = range(len(head) - length + 1) if length >= self.min_match else [0]
+            for start in starts:
+                if head[start : start + length] == repeat:
+                    return start + length
+        return 0
@@ -0,0 +1,129 @@
+"""On-disk cache of transcriptions keyed by audio content."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+
+def audio_cache_key(
+    audio_data: np.ndarray, sample_rate: int, quantization: str, asr_prompt: str
+) -> str:
+    """
+    Build a cache key from PCM samples and the settings that affect the output.
+
+    Args:
+        audio_data: Audio samples
+        sample_rate: Sample rate of the audio data
+        quantization: Model quantization (e.g. "Q8_0")
+        asr_prompt: System prompt for the ASR task
+
+    Returns:
+        SHA-256 hex digest
+    """
+    samples = np.ascontiguousarray(audio_data, dtype=np.float32)
+    digest = hashlib.sha256()
+    digest.update(f"{quantization}\0{asr_prompt}\0{sample_rate}\0".encode())
+    digest.update(str(samples.shape).encode())
+    digest.update(memoryview(samples).cast("B"))
+    return digest.hexdigest()
+
+
+def file_cache_key(audio_file_path: str, quantization: str, asr_prompt: str) -> str:
+    """
+    Build a cache key for an audio file from its decoded PCM samples.
+
+    Files that soundfile cannot decode are keyed by their raw bytes instead.
+    """
+    try:
+        audio_data, sample_rate = sf.read(audio_file_path, dtype="float32")
+    except RuntimeError:
+        digest = hashlib.sha256(f"{quantization}\0{asr_prompt}\0file\0".encode())
+        with open(audio_file_path, "rb") as f:
+            digest.update(hashlib.file_digest(f, "sha256").digest())
+        return digest.hexdigest()
+
+    return audio_cache_key(audio_data, sample_rate, quantization, asr_prompt)
+
+
+class TranscriptionCache:
+    """SQLite-backed transcription cache with least-recently-used eviction."""
+
+    def __init__(self, path: str | Path, max_entries: int = 100_000):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Number of entries kept before the least recently used
+                ones are evicted
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Shared by the offline and batch worker threads, guarded by the lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS transcriptions ("
+            "key TEXT PRIMARY KEY, "
+            "transcription TEXT NOT NULL, "
+            "last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_last_used ON transcriptions (last_used)"
+        )
+        self._conn.commit()
+        self._num_entries = self._conn.execute(
+            "SELECT COUNT(*) FROM transcriptions"
+        ).fetchone()[0]
+
+    def get(self, key: str) -> str | None:
+        """
+        Look up a transcription and mark it as recently used.
+
+        Returns:
+            Cached transcription, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT transcription FROM transcriptions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE transcriptions SET last_used = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, transcription: str) -> None:
+        """Store a transcription, evicting least recently used entries if full."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO transcriptions VALUES (?, ?, ?)",
+                (key, transcription, time.time()),
+            )
+            self._num_entries += cursor.rowcount
+
+            excess = self._num_entries - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM transcriptions WHERE key IN ("
+                    "SELECT key FROM transcriptions ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+                self._num_entries -= excess
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
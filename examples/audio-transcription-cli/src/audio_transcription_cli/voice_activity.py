@@ -0,0 +1,235 @@
+"""Voice activity detection and pause-aligned chunking of audio files."""
+
+from collections import deque
+from collections.abc import Iterator
+
+import numpy as np
+import soundfile as sf
+
+from .audio_preprocessing import AudioChunker
+
+
+class VoiceActivityDetector:
+    """Frame-level speech detector using short-time energy and zero-crossing rate."""
+
+    def __init__(
+        self,
+        frame_duration: float = 0.03,
+        energy_margin_db: float = 10.0,
+        min_energy_db: float = -50.0,
+        zcr_threshold: float = 0.25,
+        noise_floor_smoothing: float = 0.9,
+    ):
+        """
+        Initialize voice activity detector.
+
+        Args:
+            frame_duration: Duration of each analysis frame in seconds
+            energy_margin_db: Margin above the noise floor for a frame to be speech
+            min_energy_db: Absolute energy (dBFS) below which a frame is never speech
+            zcr_threshold: Zero-crossing rate above which quieter frames count as
+                speech (unvoiced consonants such as "s" or "f")
+            noise_floor_smoothing: Weight of the previous noise floor estimate when
+                a new block of frames is louder than it
+        """
+        self.frame_duration = frame_duration
+        self.energy_margin_db = energy_margin_db
+        self.min_energy_db = min_energy_db
+        self.zcr_threshold = zcr_threshold
+        self.noise_floor_smoothing = noise_floor_smoothing
+        self._noise_floor_db: float | None = None
+
+    def reset(self) -> None:
+        """Forget the noise floor estimated from previous audio."""
+        self._noise_floor_db = None
+
+    def speech_mask(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Classify frames as speech or silence.
+
+        The noise floor is tracked across calls, so blocks of the same recording
+        should be passed in order.
+
+        Args:
+            frames: Mono audio frames with shape (num_frames, frame_length)
+
+        Returns:
+            Boolean array with one entry per frame, True for speech
+        """
+        if len(frames) == 0:
+            return np.zeros(0, dtype=bool)
+
+        rms = np.sqrt(np.mean(np.square(frames), axis=1))
+        energy_db = 20.0 * np.log10(np.maximum(rms, 1e-10))
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+        # Quietest frames of the block approximate the background noise level.
+        # The estimate drops immediately but rises slowly, so long stretches of
+        # continuous speech do not get mistaken for noise.
+        block_floor_db = float(np.percentile(energy_db, 10))
+        if self._noise_floor_db is None or block_floor_db < self._noise_floor_db:
+            self._noise_floor_db = block_floor_db
+        else:
+            self._noise_floor_db = (
+                self.noise_floor_smoothing * self._noise_floor_db
+                + (1.0 - self.noise_floor_smoothing) * block_floor_db
+            )
+
+        threshold_db = max(
+            self._noise_floor_db + self.energy_margin_db, self.min_energy_db
+        )
+        voiced = energy_db > threshold_db
+        unvoiced = (energy_db > threshold_db - self.energy_margin_db / 2) & (
+            zcr > self.zcr_threshold
+        )
+        return voiced | unvoiced
+
+
+class VADChunker(AudioChunker):
+    """
+    Splits audio files into variable-length speech segments at pauses.
+
+    Silent spans are skipped entirely, and segments are capped at
+    `max_segment_duration` to bound transcription latency.
+    """
+
+    def __init__(
+        self,
+        max_segment_duration: float = 5.0,
+        min_silence_duration: float = 0.3,
+        min_speech_duration: float = 0.1,
+        padding: float = 0.1,
+        detector: VoiceActivityDetector | None = None,
+    ):
+        """
+        Initialize VAD chunker.
+
+        Args:
+            max_segment_duration: Maximum duration of a segment in seconds
+            min_silence_duration: Pause length in seconds that ends a segment
+            min_speech_duration: Segments with less speech than this are dropped
+            padding: Seconds of audio kept before and after each segment
+            detector: Voice activity detector (a default one is created if None)
+        """
+        super().__init__(chunk_duration=max_segment_duration, overlap=0.0)
+        self.max_segment_duration = max_segment_duration
+        self.min_silence_duration = min_silence_duration
+        self.min_speech_duration = min_speech_duration
+        self.padding = padding
+        self.detector = detector or VoiceActivityDetector()
+
+    def iter_audio_chunks(
+        self, audio_file_path: str, read_duration: float = 60.0
+    ) -> Iterator[tuple[np.ndarray, int, float, float]]:
+        """
+        Yield speech segments with timing information.
+
+        Args:
+            audio_file_path: Path to audio file
+            read_duration: Seconds of audio decoded per read from disk
+
+        Yields:
+            Tuple of (audio_segment, sample_rate, start_time, end_time)
+        """
+        self.detector.reset()
+
+        with sf.SoundFile(audio_file_path) as f:
+            sample_rate = f.samplerate
+
+            frame_length = int(self.detector.frame_duration * sample_rate)
+            read_frames = frame_length * max(
+                1, int(read_duration / self.detector.frame_duration)
+            )
+            max_frames = max(
+                1, int(self.max_segment_duration / self.detector.frame_duration)
+            )
+            min_silence_frames = max(
+                1, int(self.min_silence_duration / self.detector.frame_duration)
+            )
+            min_speech_frames = int(
+                self.min_speech_duration / self.detector.frame_duration
+            )
+            pad_frames = int(self.padding / self.detector.frame_duration)
+
+            # Non-speech frames preceding the current position, used as padding
+            history: deque[np.ndarray] = deque(maxlen=pad_frames)
+            segment: list[np.ndarray] = []
+            segment_start = 0
+            speech_frames = 0
+            silence_run = 0
+            frame_index = 0
+
+            for block in f.blocks(blocksize=read_frames, dtype="float32"):
+                mono = block.mean(axis=1) if block.ndim > 1 else block
+
+                # Zero-pad the last partial frame for analysis only
+                num_frames = -(-len(mono) // frame_length)
+                padded = np.zeros(num_frames * frame_length, dtype=np.float32)
+                padded[: len(mono)] = mono
+                mask = self.detector.speech_mask(
+                    padded.reshape(num_frames, frame_length)
+                )
+
+                for i, is_speech in enumerate(mask):
+                    frame = mono[i * frame_length : (i + 1) * frame_length]
+
+                    if segment:
+                        segment.append(frame)
+                        if is_speech:
+                            speech_frames += 1
+                            silence_run = 0
+                        else:
+                            silence_run += 1
+
+                        if (
+                            silence_run >= min_silence_frames
+                            or len(segment) >= max_frames
+                        ):
+                            if speech_frames >= min_speech_frames:
+                                yield self._finish_segment(
+                                    segment,
+                                    segment_start,
+                                    silence_run,
+                                    pad_frames,
+                                    frame_length,
+                                    sample_rate,
+                                )
+                            history.extend(segment[len(segment) - silence_run :])
+                            segment = []
+                    elif is_speech:
+                        segment = [*history, frame]
+                        segment_start = frame_index - len(history)
+                        history.clear()
+                        speech_frames = 1
+                        silence_run = 0
+                    else:
+                        history.append(frame)
+
+                    frame_index += 1
+
+            if segment and speech_frames >= min_speech_frames:
+                yield self._finish_segment(
+                    segment,
+                    segment_start,
+                    silence_run,
+                    pad_frames,
+                    frame_length,
+                    sample_rate,
+                )
+
+    @staticmethod
+    def _finish_segment(
+        segment: list[np.ndarray],
+        segment_start: int,
+        trailing_silence: int,
+        pad_frames: int,
+        frame_length: int,
+        sample_rate: int,
+    ) -> tuple[np.ndarray, int, float, float]:
+        """Join segment frames, trimming trailing silence beyond the padding."""
+        keep = len(segment) - max(trailing_silence - pad_frames, 0)
+        audio = np.concatenate(segment[:keep])
+        start_time = segment_start * frame_length / sample_rate
+        end_time = start_time + len(audio) / sample_rate
+        return audio, sample_rate, start_time, end_time
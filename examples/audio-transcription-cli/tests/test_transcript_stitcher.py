@@ -0,0 +1,52 @@
+from audio_transcription_cli.transcript_stitcher import (
+    TranscriptStitcher,
+    overlap_window,
+)
+
+
+def test_drops_multi_word_overlap():
+    stitcher = TranscriptStitcher()
+    stitcher.add("this is a test of the")
+    stitcher.add("test of the system")
+    assert stitcher.text == "this is a test of the system"
+
+
+def test_drops_one_word_overlap_at_boundary():
+    stitcher = TranscriptStitcher()
+    stitcher.add("a test of")
+    assert stitcher.add("of the system") == "the system"
+    assert stitcher.text == "a test of the system"
+
+
+def test_keeps_one_word_match_away_from_boundary():
+    stitcher = TranscriptStitcher()
+    stitcher.add("the cat sat down")
+    stitcher.add("on the mat")
+    assert stitcher.text == "the cat sat down on the mat"
+
+
+def test_one_word_overlap_while_streaming():
+    stitcher = TranscriptStitcher()
+    stitcher.add("a test of")
+    words = list(stitcher.add_stream(["Of", " the sys", "tem"]))
+    assert words == ["the", "system"]
+
+
+def test_ignores_match_not_ending_the_transcript():
+    stitcher = TranscriptStitcher()
+    stitcher.add("I said in the morning")
+    assert stitcher.add("morning we drove in the car") == "we drove in the car"
+
+
+def test_ignores_longer_match_further_into_the_chunk():
+    stitcher = TranscriptStitcher()
+    stitcher.add("at the end of the road and then")
+    stitcher.add("then we saw the end of the tunnel ahead")
+    assert stitcher.text == (
+        "at the end of the road and then we saw the end of the tunnel ahead"
+    )
+
+
+def test_overlap_window_bounds_the_compared_words():
+    assert overlap_window(0.0) == 0
+    assert overlap_window(0.5) == 4
@@ -1,6 +1,7 @@
 
 from pathlib import Path
 import time
+from typing import Iterable
 
 
 class AudioPlayer:
@@ -62,6 +63,49 @@ class AudioPlayer:
             print(f"Error playing audio: {e}")
             return False
     
+    def play_stream(self, chunks: Iterable[bytes], sample_rate: int) -> bool:
+        """
+        Play 16-bit mono PCM chunks as they arrive, while later chunks are still
+        being generated.
+
+        Args:
+            chunks: Little-endian int16 PCM chunks
+            sample_rate: Sampling rate of the chunks in Hz
+
+        Returns:
+            True if playback completed, False otherwise
+        """
+        if self.mixer is None:
+            print("Audio player not available")
+            return False
+
+        try:
+            # Raw buffers are interpreted in the mixer format, so match the stream
+            self.mixer.quit()
+            self.mixer.init(frequency=sample_rate, size=-16, channels=1)
+            channel = None
+
+            print("Playing audio stream...")
+            for chunk in chunks:
+                sound = self.mixer.Sound(buffer=chunk)
+                if channel is None or not channel.get_busy():
+                    channel = sound.play()
+                    continue
+
+                # A channel holds one queued sound, wait for the current one to start
+                while channel.get_queue() is not None:
+                    time.sleep(0.01)
+                channel.queue(sound)
+
+            while channel is not None and channel.get_busy():
+                time.sleep(0.1)
+            print("Audio playback completed")
+            return True
+
+        except Exception as e:
+            print(f"Error playing audio stream: {e}")
+            return False
+
     def stop(self) -> None:
         """Stop audio playback."""
         if self.mixer is not None:
@@ -1,3 +1,5 @@
+import math
+import queue
 import threading
 import time
 from typing import Callable, Optional
@@ -8,9 +10,99 @@ import numpy as np
 import pyaudio
 
 
+class StreamingVAD:
+    """
+    Voice activity detection on a stream of int16 chunks, updated incrementally
+    with no per-chunk allocation.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        silence_threshold: float = 0.01,
+        silence_duration: Optional[float] = None,
+        smoothing: float = 0.5,
+    ):
+        """
+        Initialize the detector.
+
+        Args:
+            sample_rate: Sampling rate in Hz, to turn sample counts into seconds
+            silence_threshold: RMS energy below which audio is considered silent
+            silence_duration: Seconds of silence after speech to end the recording
+                (None = never)
+            smoothing: Weight of the previous energy in its moving average, in [0, 1)
+        """
+        self.sample_rate = sample_rate
+        self.silence_threshold = silence_threshold
+        self.silence_duration = silence_duration
+        self.smoothing = smoothing
+        # Scratch buffer for the normalized chunk, grown if a chunk is larger
+        self._scratch = np.empty(1024, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        """Forget the statistics of the previous recording."""
+        self.energy = 0.0
+        # Only start the silence timer after sound is detected
+        self.has_detected_sound = False
+        self.silent_samples = 0
+
+    @property
+    def silence_seconds(self) -> float:
+        """Duration of the current silence, counted from the samples themselves."""
+        return self.silent_samples / self.sample_rate
+
+    @property
+    def should_stop(self) -> bool:
+        """True once the silence after speech lasted silence_duration."""
+        return (
+            self.silence_duration is not None
+            and self.silence_seconds >= self.silence_duration
+        )
+
+    def update(self, audio_chunk: np.ndarray) -> bool:
+        """
+        Update the statistics with a new chunk.
+
+        Args:
+            audio_chunk: int16 audio samples
+
+        Returns:
+            True if the audio is currently silent, False otherwise
+        """
+        n = len(audio_chunk)
+        if n == 0:
+            return self.energy < self.silence_threshold
+        if n > len(self._scratch):
+            self._scratch = np.empty(n, dtype=np.float32)
+
+        # Normalize to [-1, 1] range and calculate RMS energy in place
+        normalized = self._scratch[:n]
+        np.multiply(audio_chunk, 1.0 / 32768.0, out=normalized, casting="unsafe")
+        energy = math.sqrt(float(np.dot(normalized, normalized)) / n)
+        self.energy = self.smoothing * self.energy + (1.0 - self.smoothing) * energy
+
+        is_silent = self.energy < self.silence_threshold
+        if not is_silent:
+            # Sound detected - start tracking silence from now on
+            self.has_detected_sound = True
+            self.silent_samples = 0
+        elif self.has_detected_sound:
+            # Only count silence after we've heard sound
+            self.silent_samples += n
+
+        return is_silent
+
+
 class AudioRecorder:
     """
     Records audio from microphone with real-time streaming capabilities.
+
+    Audio is captured in PyAudio's callback thread straight into a preallocated
+    ring buffer, so memory use stays flat however long the recording lasts.
+    Callbacks and the audio bar run in a separate thread, so a slow consumer
+    never delays the capture.
     """
 
     def __init__(
@@ -19,6 +111,8 @@ class AudioRecorder:
         channels: int = 1,
         chunk_size: int = 1024,
         format: int = pyaudio.paInt16,
+        max_duration: float = 300.0,
+        max_fps: float = 15.0,
     ):
         """
         Initialize the audio recorder.
@@ -28,25 +122,41 @@ class AudioRecorder:
             channels: Number of audio channels (default: 1 for mono)
             chunk_size: Number of frames per buffer (default: 1024)
             format: Audio format (default: 16-bit int)
+            max_duration: Seconds of audio kept, older audio is overwritten
+                (default: 300)
+            max_fps: Maximum redraws per second of the audio bar (default: 15)
         """
         self.sample_rate = sample_rate
         self.channels = channels
         self.chunk_size = chunk_size
         self.format = format
+        self.max_fps = max_fps
 
         self.audio = pyaudio.PyAudio()
         self.stream: Optional[pyaudio.Stream] = None
-        self.frames = []
         self.is_recording = False
         self.recording_thread: Optional[threading.Thread] = None
         self.callback: Optional[Callable] = None
 
-        # Silence detection parameters
-        self.silence_threshold = 0.01  # Energy threshold for silence
-        self.silence_duration = 0.0  # Duration of current silence
-        self.max_silence_duration = None  # Max silence before stopping
-        self.last_chunk_time = None
-        self.has_detected_sound = False  # Only start silence timer after sound is detected
+        # Ring buffer of interleaved samples, a whole number of chunks long so
+        # every chunk is a contiguous view of it
+        chunk_samples = chunk_size * channels
+        n_chunks = max(1, math.ceil(max_duration * sample_rate / chunk_size))
+        self._buffer = np.zeros(n_chunks * chunk_samples, dtype=np.int16)
+        # Total samples written, the write position is modulo the size
+        self._written = 0
+        self.overflows = 0  # Chunks PortAudio reported as lost
+        self._stopped_on_silence = False
+
+        # Chunks waiting for the callback thread
+        self._chunks: queue.SimpleQueue = queue.SimpleQueue()
+
+        # Silence detection
+        self.vad = StreamingVAD(sample_rate)
+
+        # Audio bar state, the console is created once per recording
+        self._console = None
+        self._last_draw = 0.0
 
     def start_recording(
         self,
@@ -71,15 +181,18 @@ class AudioRecorder:
         # Set up callback - use rich audio bar if requested, otherwise use provided callback
         if show_audio_bar:
             self.callback = self._rich_audio_bar_callback
+            self._console = self._create_console()
+            self._last_draw = 0.0
         else:
             self.callback = callback
-        self.frames = []
+        self._written = 0
+        self.overflows = 0
+        self._stopped_on_silence = False
+        self._chunks = queue.SimpleQueue()
+        self.vad.silence_duration = silence_duration
+        self.vad.silence_threshold = silence_threshold
+        self.vad.reset()
         self.is_recording = True
-        self.silence_duration = 0.0
-        self.max_silence_duration = silence_duration
-        self.silence_threshold = silence_threshold
-        self.last_chunk_time = time.time()
-        self.has_detected_sound = False
 
         try:
             self.stream = self.audio.open(
@@ -88,6 +201,7 @@ class AudioRecorder:
                 rate=self.sample_rate,
                 input=True,
                 frames_per_buffer=self.chunk_size,
+                stream_callback=self._capture,
             )
         except Exception as e:
             print(f"Error opening audio stream: {e}")
@@ -105,131 +219,174 @@ class AudioRecorder:
         else:
             print(f"Recording started at {self.sample_rate}Hz...")
 
-    def _is_silent(self, audio_chunk: np.ndarray) -> bool:
+    def _write(self, samples: np.ndarray) -> int:
         """
-        Determine if an audio chunk is silent based on energy threshold.
+        Copy captured samples into the ring buffer.
 
         Args:
-            audio_chunk: Audio data as numpy array
+            samples: Interleaved int16 samples
 
         Returns:
-            True if chunk is silent, False otherwise
+            Offset of the chunk in the whole recording, see `_read`
         """
-        # Normalize to [-1, 1] range
-        if audio_chunk.dtype == np.int16:
-            normalized = audio_chunk.astype(np.float32) / 32768.0
-        else:
-            normalized = audio_chunk
+        size = len(self._buffer)
+        offset = self._written
+        start = offset % size
+        end = start + len(samples)
 
-        # Calculate RMS energy
-        energy = np.sqrt(np.mean(normalized**2))
+        if end <= size:
+            self._buffer[start:end] = samples
+        else:
+            # Only happens if PortAudio delivers a chunk of an unexpected size
+            first = size - start
+            self._buffer[start:] = samples[:first]
+            self._buffer[: end - size] = samples[first:]
 
-        return energy < self.silence_threshold
+        self._written += len(samples)
+        return offset
 
-    def _rich_audio_bar_callback(self, chunk, is_silent):
+    def _read(self, offset: int, length: int) -> Optional[np.ndarray]:
         """
-        Rich audio visualization callback with colorful progress bar.
+        Copy a chunk out of the ring buffer.
+
+        Args:
+            offset: Offset of the chunk in the whole recording
+            length: Number of samples
+
+        Returns:
+            The chunk, or None if it was already overwritten
         """
+        size = len(self._buffer)
+        if self._written - offset > size:
+            return None
+
+        start = offset % size
+        end = start + length
+        if end <= size:
+            return self._buffer[start:end].copy()
+        return np.concatenate((self._buffer[start:], self._buffer[: end - size]))
+
+    def _capture(self, in_data, frame_count, time_info, status_flags):
+        """PyAudio stream callback: store the chunk and update the silence detection."""
+        if status_flags & pyaudio.paInputOverflow:
+            self.overflows += 1
+
+        if not self.is_recording:
+            return (None, pyaudio.paComplete)
+
+        # Only offsets are queued, the callback thread copies the chunk out of the ring
+        samples = np.frombuffer(in_data, dtype=np.int16)
+        offset = self._write(samples)
+        is_silent = self.vad.update(samples)
+        self._chunks.put((offset, len(samples), is_silent))
+
+        if self.vad.should_stop:
+            # Reported by `_record_loop`, printing here could delay the capture
+            self._stopped_on_silence = True
+            self.is_recording = False
+            return (None, pyaudio.paComplete)
+
+        return (None, pyaudio.paContinue)
+
+    def _create_console(self):
+        """Create the rich console of the audio bar, None if rich is not available."""
         try:
             from rich.console import Console
-            from rich.text import Text
             import sys
-            
-            # Calculate energy level
-            normalized = chunk.astype(np.float32) / 32768.0
-            energy = np.sqrt(np.mean(normalized**2))
-            
-            console = Console(file=sys.stdout, force_terminal=True)
-            
-            # Amplify the visualization scale for better visibility
-            energy_percent = min(energy * 500, 100)  # Scale to 0-100%
-            
-            # Create colored status indicator (fixed width to prevent shifting)
-            if is_silent:
-                status = Text("🔇 SILENT  ", style="red bold")
-            else:
-                status = Text("🎤 SPEAKING", style="green bold")
-            
-            # Create visual bar using rich characters
-            bar_width = 30
-            filled_width = int((energy_percent / 100) * bar_width)
-            
-            if energy_percent > 80:
-                bar_style = "red on red"
-            elif energy_percent > 50:
-                bar_style = "yellow on yellow"
-            elif energy_percent > 20:
-                bar_style = "green on green"
-            else:
-                bar_style = "blue on blue"
-            
-            # Create the bar visualization
-            filled_bar = "█" * filled_width
-            empty_bar = "░" * (bar_width - filled_width)
-            
-            bar_text = Text(filled_bar, style=bar_style) + Text(empty_bar, style="dim white")
-            
-            # Print the complete line with proper overwrite
-            output = Text.assemble(
-                status, " ",
-                Text("Audio: "), bar_text,
-                Text(f" {energy_percent:5.1f}% ", style="cyan"),
-                Text(f"({energy:.6f})", style="dim")
-            )
-            
-            # Clear line and print new content
-            console.print("\r" + " " * 80, end="\r")  # Clear the line first
-            console.print(output, end="", highlight=False)
-            
+
+            return Console(file=sys.stdout, force_terminal=True)
         except ImportError:
+            return None
+
+    def _rich_audio_bar_callback(self, chunk, is_silent):
+        """
+        Rich audio visualization callback with colorful progress bar.
+
+        Redraws at most max_fps times per second, skipping the chunks in between.
+        """
+        now = time.monotonic()
+        if now - self._last_draw < 1.0 / self.max_fps:
+            return
+        self._last_draw = now
+
+        # Smoothed energy level, already computed by the silence detection
+        energy = self.vad.energy
+
+        # Amplify the visualization scale for better visibility
+        energy_percent = min(energy * 500, 100)  # Scale to 0-100%
+
+        if self._console is None:
             # Fallback to simple text if rich is not available
-            energy = np.sqrt(np.mean((chunk.astype(np.float32) / 32768.0)**2))
-            energy_percent = min(energy * 500, 100)
             status = "SILENT" if is_silent else "SPEAKING"
             bar = "=" * int(energy_percent / 3)  # Simple text bar
             print(f"\r{status} Audio: {bar:<30} {energy_percent:5.1f}%", end="", flush=True)
+            return
+
+        from rich.text import Text
+
+        # Create colored status indicator (fixed width to prevent shifting)
+        if is_silent:
+            status = Text("🔇 SILENT  ", style="red bold")
+        else:
+            status = Text("🎤 SPEAKING", style="green bold")
+
+        # Create visual bar using rich characters
+        bar_width = 30
+        filled_width = int((energy_percent / 100) * bar_width)
+
+        if energy_percent > 80:
+            bar_style = "red on red"
+        elif energy_percent > 50:
+            bar_style = "yellow on yellow"
+        elif energy_percent > 20:
+            bar_style = "green on green"
+        else:
+            bar_style = "blue on blue"
+
+        # Create the bar visualization
+        filled_bar = "█" * filled_width
+        empty_bar = "░" * (bar_width - filled_width)
+
+        bar_text = Text(filled_bar, style=bar_style)
+        bar_text += Text(empty_bar, style="dim white")
+
+        # Print the complete line with proper overwrite
+        output = Text.assemble(
+            status, " ",
+            Text("Audio: "), bar_text,
+            Text(f" {energy_percent:5.1f}% ", style="cyan"),
+            Text(f"({energy:.6f})", style="dim")
+        )
+
+        # Clear line and print new content
+        self._console.print("\r" + " " * 80, end="\r")  # Clear the line first
+        self._console.print(output, end="", highlight=False)
 
     def _record_loop(self):
-        """Internal loop for recording audio chunks."""
-        while self.is_recording:
+        """Internal loop handing the captured chunks to the callback."""
+        while self.is_recording or not self._chunks.empty():
             try:
-                current_time = time.time()
-                data = self.stream.read(self.chunk_size, exception_on_overflow=False)
-                self.frames.append(data)
-
-                # Convert to numpy array for analysis
-                audio_chunk = np.frombuffer(data, dtype=np.int16)
-
-                # Check for silence if auto-stop is enabled
-                if self.max_silence_duration is not None:
-                    is_silent = self._is_silent(audio_chunk)
-
-                    if not is_silent:
-                        # Sound detected - start tracking silence from now on
-                        self.has_detected_sound = True
-                        self.silence_duration = 0.0
-                    elif self.has_detected_sound:
-                        # Only count silence after we've heard sound
-                        elapsed = current_time - self.last_chunk_time
-                        self.silence_duration += elapsed
-
-                        if self.silence_duration >= self.max_silence_duration:
-                            print(
-                                f"\nSilence detected for {self.silence_duration:.1f}s. Stopping recording..."
-                            )
-                            self.is_recording = False
-                            break
-
-                self.last_chunk_time = current_time
-
-                # Call callback with the audio chunk if provided
-                if self.callback:
-                    callback_is_silent = is_silent if self.max_silence_duration else self._is_silent(audio_chunk)
-                    self.callback(audio_chunk, callback_is_silent)
-
-            except Exception as e:
-                print(f"Error during recording: {e}")
-                break
+                offset, length, is_silent = self._chunks.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            # Call callback with the audio chunk if provided
+            if self.callback:
+                audio_chunk = self._read(offset, length)
+                if audio_chunk is None:
+                    # Fell behind by a whole buffer, skip to fresher chunks
+                    continue
+                try:
+                    self.callback(audio_chunk, is_silent)
+                except Exception as e:
+                    print(f"Error during recording: {e}")
+                    self.callback = None
+
+        if self._stopped_on_silence:
+            print(
+                f"\nSilence detected for {self.vad.silence_seconds:.1f}s. "
+                "Stopping recording..."
+            )
 
     def stop_recording(self) -> np.ndarray:
         """
@@ -238,7 +395,7 @@ class AudioRecorder:
         Returns:
             numpy array of the recorded audio
         """
-        was_recording = self.is_recording or len(self.frames) > 0
+        was_recording = self.is_recording or self._written > 0
         
         if not was_recording:
             print("Not currently recording!")
@@ -246,20 +403,32 @@ class AudioRecorder:
 
         self.is_recording = False
 
-        if self.recording_thread:
-            self.recording_thread.join()
-
         if self.stream:
             self.stream.stop_stream()
             self.stream.close()
+            self.stream = None
 
-        if not was_recording:
-            print("Recording stopped.")
+        if self.recording_thread:
+            self.recording_thread.join()
+            self.recording_thread = None
 
-        # Convert frames to numpy array
-        audio_data = b"".join(self.frames)
-        audio_array = np.frombuffer(audio_data, dtype=np.int16)
+        if self.overflows:
+            print(f"Warning: {self.overflows} audio chunks were lost during recording")
+
+        # Unroll the ring buffer, oldest samples first
+        size = len(self._buffer)
+        if self._written <= size:
+            audio_array = self._buffer[: self._written].copy()
+        else:
+            kept = size / self.channels / self.sample_rate
+            print(
+                f"Warning: recording longer than the buffer, kept the last {kept:.0f}s"
+            )
+            start = self._written % size
+            audio_array = np.concatenate((self._buffer[start:], self._buffer[:start]))
 
+        # The audio is handed over, a second call has nothing to return
+        self._written = 0
         return audio_array
 
     def save_to_file(self, filename: str, audio_data: np.ndarray):
@@ -1,8 +1,10 @@
+import queue
+import threading
 import time
+from typing import Iterator
 
 import torch
 import torchaudio
-from pathlib import Path
 from liquid_audio import LFM2AudioModel, LFM2AudioProcessor, ChatState, LFMModality
 
 from .modal_infra import (
@@ -12,7 +14,6 @@ from .modal_infra import (
     get_secrets,
     get_volume,
 )
-from .audio_file_manager import AudioFileManager
 from .audio_recorder import AudioRecorder
 from .audio_player import AudioPlayer
 
@@ -21,6 +22,11 @@ app = get_modal_app("voice-chat-example")
 image = get_docker_image()
 volume = get_volume("voice-chat-example-volume")
 
+# Sampling rate of the recorded questions
+RECORDING_SAMPLE_RATE = 16_000
+# Sampling rate of the generated answers (Mimi)
+OUTPUT_SAMPLE_RATE = 24_000
+
 def generate_session_id() -> str:
     """
     Generate a unique session ID based on the current timestamp.
@@ -30,16 +36,16 @@ def generate_session_id() -> str:
     session_id = now.strftime("%Y%m%d_%H%M%S")
     return session_id
 
-def record() -> Path:
+def record() -> bytes:
     """
-    Records from the microphone and saves to a local wav file.
+    Records from the microphone, keeping the audio in memory.
 
     Returns:
-        Path to the saved wav file.
+        The recording as 16-bit mono PCM at RECORDING_SAMPLE_RATE.
     """
     # import numpy as np
     
-    recorder = AudioRecorder(sample_rate=16000, channels=1)
+    recorder = AudioRecorder(sample_rate=RECORDING_SAMPLE_RATE, channels=1)
 
     print("Starting recording... Speak now!")
     
@@ -61,51 +67,105 @@ def record() -> Path:
     
     print(f"Audio data length: {len(audio_data)} samples")
 
-    # Save it
-    filename = "user_recording.wav"
-    recorder.save_to_file(filename, audio_data)
     recorder.cleanup()
-    
-    # Return absolute path to the file
-    return Path(filename).resolve()
+
+    return audio_data.tobytes()
+
+class LocalModel:
+    """
+    Generates the answers in this process on CPU, without Modal. The model is
+    loaded once and the conversation goes on across questions.
+    """
+
+    def __init__(self):
+        from .conversation_store import Conversation
+        from .responder import VoiceResponder
+
+        self.responder = VoiceResponder(device="cpu")
+        self.conversation = Conversation(self.responder.processor)
+
+    def stream(self, pcm: bytes) -> Iterator[bytes]:
+        """
+        Answer a question, generating in a background thread so generation keeps
+        going while the caller plays the chunks already decoded.
+
+        Args:
+            pcm: Question as 16-bit mono PCM at RECORDING_SAMPLE_RATE
+
+        Yields:
+            16-bit mono PCM chunks at VoiceResponder.OUTPUT_SAMPLE_RATE
+        """
+        from .responder import from_pcm16, to_pcm16
+
+        wav = from_pcm16(pcm)
+        chunks: queue.Queue = queue.Queue()
+
+        def generate():
+            try:
+                for chunk in self.responder.stream(
+                    wav, RECORDING_SAMPLE_RATE, self.conversation
+                ):
+                    chunks.put(to_pcm16(chunk))
+            finally:
+                chunks.put(None)
+
+        threading.Thread(target=generate, daemon=True).start()
+        while (chunk := chunks.get()) is not None:
+            yield chunk
 
 @app.local_entrypoint()
-def local_entrypoint():
+def local_entrypoint(local: bool = False, archive: bool = False):
 
-    # generate a unique session id
+    # generate a unique session id, the conversation lasts until the client stops
     session_id = generate_session_id()
 
-    # initialize audio file manager and push audio file to modal volume
-    audio_manager = AudioFileManager(
-        volume_name="voice-chat-example-volume",
-        session_id=session_id
-    )
-
-    # record user question
-    audio_file = record()
+    if local:
+        local_model = LocalModel()
+    else:
+        import modal
+        model = modal.Cls.from_name("voice-chat-example", "VoiceChatModel")()
 
-    # upload audio file (automatically goes to session directory)
-    audio_manager.upload(str(audio_file))
-    
-    # run remote function and get the generated audio file path
-    # remote_audio_path = run.remote(session_id)
-    import modal
-    remote_audio_path = modal.Function.from_name("voice-chat-example", "get_model_response").remote(session_id)
-    print(f"Audio generated at: {remote_audio_path}")
-    
-    # download the generated answer
-    local_answer_path = f"answer_{session_id}.wav"
-    
-    audio_manager.download("answer1.wav", local_answer_path)
-    
-    print(f"Generated audio saved to: {local_answer_path}")
-    
-    # Play the generated audio
     player = AudioPlayer()
-    player.play(local_answer_path)
-    player.cleanup()
+    try:
+        while True:
+            # record user question
+            pcm = record()
+
+            if local:
+                # answer it on this machine
+                chunks = local_model.stream(pcm)
+            else:
+                # send the recording with the call and stream the answer back from
+                # the deployed model service while it is generated
+                chunks = model.stream_model_response.remote_gen(
+                    pcm, RECORDING_SAMPLE_RATE, session_id, archive=archive
+                )
+
+            # Play the answer as it arrives
+            player.play_stream(chunks, sample_rate=OUTPUT_SAMPLE_RATE)
+            print("\nAsk a follow-up question, or press Ctrl+C to quit.")
+    except KeyboardInterrupt:
+        print("\nBye!")
+    finally:
+        player.cleanup()
+
+    if archive and not local:
+        print(f"Questions and answers archived in the volume under /{session_id}")
 
 if __name__ == "__main__":
+    import argparse
 
-    local_entrypoint()
+    parser = argparse.ArgumentParser(description="Voice chat with LFM2-Audio-1.5B")
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Run the model on this machine's CPU instead of the Modal GPU service",
+    )
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="Save the question and answer to the Modal sessions volume",
+    )
+    args = parser.parse_args()
 
+    local_entrypoint(local=args.local, archive=args.archive)
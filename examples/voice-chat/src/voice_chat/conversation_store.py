@@ -0,0 +1,195 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from liquid_audio import ChatState, LFM2AudioProcessor
+import torch
+
+SYSTEM_PROMPT = "Respond with interleaved text and audio."
+
+
+@dataclass
+class Turn:
+    """A question and the generated answer tokens, enough to rebuild the chat."""
+
+    wav: torch.Tensor
+    sample_rate: int
+    text: torch.Tensor
+    audio_out: torch.Tensor
+    modality_flag: torch.Tensor
+
+
+class Conversation:
+    """
+    Chat history of a session. The ChatState keeps the already processed turns, so
+    each question only adds its own audio to it. The model still prefills the whole
+    history on every turn.
+    """
+
+    def __init__(
+        self,
+        processor: LFM2AudioProcessor,
+        turns: Optional[list[Turn]] = None,
+        max_turns: int = 8,
+        trim_every: int = 4,
+        questions_asked: int = 0,
+    ):
+        """
+        Build the chat from previous turns.
+
+        Args:
+            processor: Processor used to encode the turns
+            turns: Previous turns to replay, e.g. after a spill to disk
+            max_turns: Turns kept in the history, older ones are forgotten
+            trim_every: Extra turns let in before trimming back to max_turns, so the
+                history is re-encoded once every trim_every turns instead of every turn
+            questions_asked: Questions asked so far in the session, including
+                forgotten and failed ones
+        """
+        self.processor = processor
+        self.max_turns = max_turns
+        self.trim_every = trim_every
+        # Never decreases, unlike the trimmed history, e.g. to number archived files
+        self.questions_asked = questions_asked
+        self.turns: list[Turn] = []
+        self.rebuild(turns or [])
+
+    def rebuild(self, turns: list[Turn]) -> None:
+        """
+        Reset the chat to the given turns, dropping any turn left incomplete.
+
+        Args:
+            turns: Turns to replay after the system prompt
+        """
+        self.turns = turns[-self.max_turns :]
+        self.chat = ChatState(self.processor)
+
+        self.chat.new_turn("system")
+        self.chat.add_text(SYSTEM_PROMPT)
+        self.chat.end_turn()
+
+        for turn in self.turns:
+            self.chat.new_turn("user")
+            self.chat.add_audio(turn.wav, turn.sample_rate)
+            self.chat.end_turn()
+            self.chat.new_turn("assistant")
+            self._append_answer(turn)
+
+    def ask(self, wav: torch.Tensor, sample_rate: int) -> ChatState:
+        """
+        Add a spoken question and open the assistant turn.
+
+        Args:
+            wav: Question audio, shaped (channels, samples)
+            sample_rate: Sampling rate of the question audio
+
+        Returns:
+            The chat to generate the answer from
+        """
+        self.questions_asked += 1
+        self.chat.new_turn("user")
+        self.chat.add_audio(wav, sample_rate)
+        self.chat.end_turn()
+
+        self.chat.new_turn("assistant")
+        return self.chat
+
+    def answer(self, turn: Turn) -> None:
+        """
+        Close the assistant turn opened by `ask` with the generated tokens.
+
+        Args:
+            turn: The question and its generated answer
+        """
+        self._append_answer(turn)
+        self.turns.append(turn)
+
+        if len(self.turns) >= self.max_turns + self.trim_every:
+            # Keep the prompt bounded, rebuilding the chat only every trim_every turns
+            self.rebuild(self.turns)
+
+    def _append_answer(self, turn: Turn) -> None:
+        self.chat.append(
+            text=turn.text, audio_out=turn.audio_out, modality_flag=turn.modality_flag
+        )
+        self.chat.end_turn()
+
+
+class ConversationStore:
+    """
+    Conversations by session ID. The most recently used ones stay in memory, the
+    others are spilled to disk and replayed when their session comes back.
+    """
+
+    def __init__(
+        self,
+        processor: LFM2AudioProcessor,
+        max_in_memory: int = 32,
+        spill_dir: Optional[Path] = None,
+    ):
+        """
+        Initialize an empty store.
+
+        Args:
+            processor: Processor used to encode the turns
+            max_in_memory: Conversations kept in memory before spilling the oldest
+            spill_dir: Where spilled conversations go, None forgets them instead
+        """
+        self.processor = processor
+        self.max_in_memory = max_in_memory
+        self.spill_dir = spill_dir
+        self._conversations: OrderedDict[str, Conversation] = OrderedDict()
+
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, session_id: str) -> Conversation:
+        """
+        Get the conversation of a session, starting one if it is new.
+
+        Args:
+            session_id: Unique session identifier
+
+        Returns:
+            The conversation, marked as the most recently used
+        """
+        conversation = self._conversations.get(session_id)
+        if conversation is not None:
+            self._conversations.move_to_end(session_id)
+            return conversation
+
+        conversation = Conversation(self.processor, **self._load(session_id))
+        self._conversations[session_id] = conversation
+
+        while len(self._conversations) > self.max_in_memory:
+            evicted_id, evicted = self._conversations.popitem(last=False)
+            self._spill(evicted_id, evicted)
+
+        return conversation
+
+    def _spill_path(self, session_id: str) -> Optional[Path]:
+        if self.spill_dir is None:
+            return None
+        return self.spill_dir / f"{session_id}.pt"
+
+    def _spill(self, session_id: str, conversation: Conversation) -> None:
+        path = self._spill_path(session_id)
+        if path is not None and conversation.questions_asked:
+            torch.save(
+                {
+                    "turns": conversation.turns,
+                    "questions_asked": conversation.questions_asked,
+                },
+                path,
+            )
+
+    def _load(self, session_id: str) -> dict:
+        path = self._spill_path(session_id)
+        if path is None or not path.exists():
+            return {}
+
+        state = torch.load(path, weights_only=False)
+        # Back in memory, the file would get stale
+        path.unlink()
+        return state
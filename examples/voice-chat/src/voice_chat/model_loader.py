@@ -1,44 +1,49 @@
-
 from typing import Tuple
 from liquid_audio import LFM2AudioModel, LFM2AudioProcessor
 
 
 class ModelLoader:
     """Handles loading and management of LFM2 audio models."""
-    
-    def __init__(self, repo_id: str = "LiquidAI/LFM2-Audio-1.5B"):
+
+    def __init__(self, repo_id: str = "LiquidAI/LFM2-Audio-1.5B", device: str = "cuda"):
         """
         Initialize the ModelLoader.
-        
+
         Args:
             repo_id: HuggingFace repository ID for the model
+            device: Device to load the models on, "cuda" or "cpu"
         """
         self.repo_id = repo_id
+        self.device = device
         self.processor = None
         self.model = None
-        
+
     def load_models(self) -> Tuple[LFM2AudioProcessor, LFM2AudioModel]:
         """
         Load the LFM2 audio processor and model.
-        
+
         Returns:
             Tuple of (processor, model) both in eval mode
         """
-        print(f"Loading models from {self.repo_id}...")
-        
-        self.processor = LFM2AudioProcessor.from_pretrained(self.repo_id).eval()
-        self.model = LFM2AudioModel.from_pretrained(self.repo_id).eval()
-        
+        print(f"Loading models from {self.repo_id} on {self.device}...")
+
+        self.processor = LFM2AudioProcessor.from_pretrained(
+            self.repo_id, device=self.device
+        ).eval()
+        self.model = LFM2AudioModel.from_pretrained(
+            self.repo_id, device=self.device
+        ).eval()
+
         print("Models loaded successfully")
         return self.processor, self.model
-    
+
     def get_models(self) -> Tuple[LFM2AudioProcessor, LFM2AudioModel]:
         """
         Get the loaded models. Load them if not already loaded.
-        
+
         Returns:
             Tuple of (processor, model)
         """
         if self.processor is None or self.model is None:
             return self.load_models()
-        return self.processor, self.model
\ No newline at end of file
+        return self.processor, self.model
@@ -0,0 +1,137 @@
+from typing import Iterator, Optional
+
+from liquid_audio import LFMModality
+import torch
+
+from .conversation_store import Conversation, Turn
+from .model_loader import ModelLoader
+
+# Mimi code marking the end of an audio segment
+END_OF_AUDIO = 2048
+
+
+class VoiceResponder:
+    """
+    Generates voice answers with LFM2-Audio-1.5B, keeping the models loaded between
+    questions. Used by the Modal GPU service and by the local CPU mode of the client.
+    """
+
+    # Mimi returns audio at 24kHz
+    OUTPUT_SAMPLE_RATE = 24_000
+
+    def __init__(self, device: str = "cuda"):
+        """
+        Load the processor and model once.
+
+        Args:
+            device: Device to run the models on, "cuda" or "cpu"
+        """
+        self.processor, self.model = ModelLoader(device=device).get_models()
+
+    @torch.no_grad()
+    def stream(
+        self,
+        wav: torch.Tensor,
+        sampling_rate: int,
+        conversation: Optional[Conversation] = None,
+        window_frames: int = 6,
+    ) -> Iterator[torch.Tensor]:
+        """
+        Generate the interleaved text and audio answer to a spoken question, yielding
+        audio as soon as each window of Mimi codes is generated.
+
+        Args:
+            wav: Question audio, shaped (channels, samples)
+            sampling_rate: Sampling rate of the question audio
+            conversation: Previous turns of the session, extended with this one
+                (None answers without history)
+            window_frames: Mimi frames (80ms each) decoded at once
+
+        Yields:
+            Answer waveform chunks at OUTPUT_SAMPLE_RATE, shaped (channels, samples)
+        """
+        if conversation is None:
+            conversation = Conversation(self.processor)
+        chat = conversation.ask(wav, sampling_rate)
+
+        # Generate text and audio tokens, decoding audio while generation continues.
+        # In streaming mode Mimi keeps its decoder state between windows, so
+        # consecutive chunks join without clicks.
+        text_out: list[torch.Tensor] = []
+        audio_out: list[torch.Tensor] = []
+        modality_out: list[LFMModality] = []
+        window: list[torch.Tensor] = []
+        try:
+            with self.processor.mimi.streaming(1):
+                for t in self.model.generate_interleaved(
+                    **chat, max_new_tokens=512, audio_temperature=1.0, audio_top_k=4
+                ):
+                    if t.numel() == 1:
+                        print(self.processor.text.decode(t), end="", flush=True)
+                        text_out.append(t)
+                        modality_out.append(LFMModality.TEXT)
+                        continue
+
+                    audio_out.append(t)
+                    modality_out.append(LFMModality.AUDIO_OUT)
+                    # Skip the "end-of-audio" codes
+                    if (t == END_OF_AUDIO).any():
+                        continue
+                    window.append(t)
+                    if len(window) == window_frames:
+                        yield self._decode(window)
+                        window = []
+
+                if window:
+                    yield self._decode(window)
+            print()
+        except BaseException:
+            # Interrupted answer, e.g. the client went away: forget the question
+            conversation.rebuild(conversation.turns)
+            raise
+
+        if not text_out or not audio_out:
+            conversation.rebuild(conversation.turns)
+            return
+
+        # The next question of the session builds on this answer
+        conversation.answer(
+            Turn(
+                wav=wav,
+                sample_rate=sampling_rate,
+                text=torch.stack(text_out, 1),
+                audio_out=torch.stack(audio_out, 1),
+                modality_flag=torch.tensor(modality_out),
+            )
+        )
+
+    def _decode(self, window: list[torch.Tensor]) -> torch.Tensor:
+        mimi_codes = torch.stack(window, 1).unsqueeze(0)
+        return self.processor.mimi.decode(mimi_codes)[0].cpu()
+
+
+def to_pcm16(waveform: torch.Tensor) -> bytes:
+    """
+    Convert a mono float waveform in [-1, 1] to 16-bit PCM bytes.
+
+    Args:
+        waveform: Audio shaped (1, samples)
+
+    Returns:
+        Little-endian int16 samples
+    """
+    return (waveform.clamp(-1.0, 1.0) * 32767).to(torch.int16).numpy().tobytes()
+
+
+def from_pcm16(pcm: bytes) -> torch.Tensor:
+    """
+    Convert 16-bit mono PCM bytes to a float waveform in [-1, 1].
+
+    Args:
+        pcm: Little-endian int16 samples
+
+    Returns:
+        Audio shaped (1, samples)
+    """
+    samples = torch.frombuffer(bytearray(pcm), dtype=torch.int16)
+    return (samples.to(torch.float32) / 32768.0).unsqueeze(0)
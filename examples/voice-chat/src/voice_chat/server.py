@@ -1,9 +1,9 @@
-import time
+from pathlib import Path
+from typing import Iterator
 
+import modal
 import torch
 import torchaudio
-from pathlib import Path
-from liquid_audio import LFM2AudioModel, LFM2AudioProcessor, ChatState, LFMModality
 
 from .modal_infra import (
     get_docker_image,
@@ -12,17 +12,15 @@ from .modal_infra import (
     get_secrets,
     get_volume,
 )
-from .audio_file_manager import AudioFileManager
-from .audio_recorder import AudioRecorder
-from .audio_player import AudioPlayer
-from .model_loader import ModelLoader
+from .conversation_store import ConversationStore
+from .responder import VoiceResponder, from_pcm16, to_pcm16
 
 app = get_modal_app("voice-chat-example")
 image = get_docker_image()
 sessions_volume = get_volume("voice-chat-example-volume")
 model_volume = get_volume("models")
 
-@app.function(
+@app.cls(
     image=image,
     gpu="L40S",
     volumes={
@@ -32,58 +30,62 @@ model_volume = get_volume("models")
     secrets=get_secrets(),
     timeout=1 * 60 * 60,
     retries=get_retries(max_retries=1),
-    max_inputs=1,  # Ensure we get a fresh container on retry
+    # Keep the container and its loaded model between questions
+    scaledown_window=10 * 60,
 )
-def get_model_response(session_id: str) -> str:
+class VoiceChatModel:
     """
-    Run the LFM2-Audio-1.5B model to generate a voice response for the given session ID.
-    
-    Args:
-        session_id: Unique session identifier for organizing files
-
-    Returns:
-        Path to the generated answer audio file (relative to /sessions)
+    Long-lived LFM2-Audio-1.5B service: the model is loaded once per container and
+    then serves the questions of every session.
     """
-    processor, model = ModelLoader().load_models()
 
-    # Set up inputs for the model
-    chat = ChatState(processor)
+    @modal.enter()
+    def load_models(self):
+        """Load the processor and model when the container starts."""
+        self.responder = VoiceResponder(device="cuda")
+        # Sessions go on with their previous turns instead of starting over
+        self.conversations = ConversationStore(
+            self.responder.processor, spill_dir=Path("/tmp/conversations")
+        )
+
+    @modal.method(is_generator=True)
+    def stream_model_response(
+        self, pcm: bytes, sample_rate: int, session_id: str, archive: bool = False
+    ) -> Iterator[bytes]:
+        """
+        Run the LFM2-Audio-1.5B model to generate a voice response to a recorded
+        question, streaming the audio while it is generated.
 
-    # System prompt
-    chat.new_turn("system")
-    chat.add_text("Respond with interleaved text and audio.")
-    chat.end_turn()
+        Audio travels with the call, the sessions volume is only written to archive it.
+        The question is answered in the context of the previous turns of the session.
 
-    # User prompt with audio input
-    chat.new_turn("user")
-    wav, sampling_rate = torchaudio.load(f"/sessions/{session_id}/question.wav")
-    chat.add_audio(wav, sampling_rate)
-    chat.end_turn()
+        Args:
+            pcm: Question as 16-bit mono PCM
+            sample_rate: Sampling rate of the question in Hz
+            session_id: Unique session identifier, keys the conversation history
+            archive: Save the question and answer to the sessions volume
 
-    chat.new_turn("assistant")
+        Yields:
+            16-bit mono PCM chunks at VoiceResponder.OUTPUT_SAMPLE_RATE
+        """
+        wav = from_pcm16(pcm)
+        conversation = self.conversations.get(session_id)
 
-    # Generate text and audio tokens.
-    text_out: list[torch.Tensor] = []
-    audio_out: list[torch.Tensor] = []
-    modality_out: list[LFMModality] = []
-    for t in model.generate_interleaved(**chat, max_new_tokens=512, audio_temperature=1.0, audio_top_k=4):
-        if t.numel() == 1:
-            print(processor.text.decode(t), end="", flush=True)
-            text_out.append(t)
-            modality_out.append(LFMModality.TEXT)
-        else:
-            audio_out.append(t)
-            modality_out.append(LFMModality.AUDIO_OUT)
+        chunks: list[torch.Tensor] = []
+        for chunk in self.responder.stream(wav, sample_rate, conversation):
+            chunks.append(chunk)
+            yield to_pcm16(chunk)
 
-    # Detokenize audio, removing the last "end-of-audio" codes
-    # Mimi returns audio at 24kHz
-    mimi_codes = torch.stack(audio_out[:-1], 1).unsqueeze(0)
-    with torch.no_grad():
-        waveform = processor.mimi.decode(mimi_codes)[0]
-    
-    # Save the generated audio file
-    answer_path = f"/sessions/{session_id}/answer1.wav"
-    torchaudio.save(answer_path, waveform.cpu(), 24_000)
-    
-    # Return the path to the generated audio file (remove /sessions prefix)
-    return answer_path.replace("/sessions", "")
\ No newline at end of file
+        if archive and chunks:
+            session_dir = Path("/sessions") / session_id
+            session_dir.mkdir(parents=True, exist_ok=True)
+            turn_number = conversation.questions_asked
+            torchaudio.save(
+                str(session_dir / f"question{turn_number}.wav"), wav, sample_rate
+            )
+            torchaudio.save(
+                str(session_dir / f"answer{turn_number}.wav"),
+                torch.cat(chunks, dim=-1),
+                VoiceResponder.OUTPUT_SAMPLE_RATE,
+            )
+            sessions_volume.commit()